@@ -0,0 +1,26 @@
+"""add chunk_summaries column to meetings
+
+Revision ID: 3c9d5e7f1a2b
+Revises: b12811c68aca
+Create Date: 2026-10-18 10:12:44.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9d5e7f1a2b'
+down_revision: Union[str, None] = 'b12811c68aca'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('meetings', sa.Column('chunk_summaries', postgresql.JSONB(astext_type=sa.Text()), nullable=True), schema='assistant')
+
+
+def downgrade() -> None:
+    op.drop_column('meetings', 'chunk_summaries', schema='assistant')
@@ -0,0 +1,26 @@
+"""add playback_manifest column to meetings
+
+Revision ID: 5e1f7a9c2d4b
+Revises: 3c9d5e7f1a2b
+Create Date: 2026-10-18 16:40:12.508417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e1f7a9c2d4b'
+down_revision: Union[str, None] = '3c9d5e7f1a2b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('meetings', sa.Column('playback_manifest', sa.String(), nullable=True), schema='assistant')
+
+
+def downgrade() -> None:
+    op.drop_column('meetings', 'playback_manifest', schema='assistant')
@@ -11,6 +11,11 @@ from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 from app.services.meetings.meeting_data import MeetingService
+from app.services.meeting_pipeline.progress import register_job_owner, get_job_owner, stream_summary_progress
+from app.services.meetings.caption_stream import stream_live_captions
+from app.core.errors import MeetingError, MeetingErrorMessages, ErrorCode
+from starlette.responses import StreamingResponse, Response
+from fastapi import status
 
 router = APIRouter(prefix="/meetings", tags=["meetings"])
 
@@ -23,8 +28,49 @@ async def join_and_record(request: MeetRequest, current_user=Depends(get_current
         "user_id": current_user.user_id  # Server-provided user ID
     }
     job = record_meeting_task.delay(job_data)
+    await register_job_owner(job.id, current_user.user_id)
     return {"status": "queued", "job_id": job.id}
 
+async def ensure_job_owner(job_id: str, current_user) -> None:
+    owner = await get_job_owner(job_id)
+    if owner is None:
+        raise MeetingError(
+            error_code=ErrorCode.MEETING_NOT_FOUND,
+            message=MeetingErrorMessages.MEETING_NOT_FOUND,
+            status_code=status.HTTP_404_NOT_FOUND
+        )
+    if owner != str(current_user.user_id):
+        raise MeetingError(
+            error_code=ErrorCode.MEETING_ACCESS_DENIED,
+            message=MeetingErrorMessages.MEETING_ACCESS_DENIED,
+            status_code=status.HTTP_403_FORBIDDEN
+        )
+
+@router.get("/jobs/{job_id}/summary-stream")
+async def stream_summary(job_id: str, current_user=Depends(get_current_user)):
+    """
+    Server-Sent Events stream of a meeting job's partial summaries.
+
+    Events: `chunk_summary` (one per summarized chunk / caption window),
+    `reduce_summary` (intermediate merges), `summary` (final structured summary),
+    then `done` (with the stored meeting id) or `error`.
+    Events published before the client connects are replayed first.
+    """
+    await ensure_job_owner(job_id, current_user)
+    return StreamingResponse(stream_summary_progress(job_id), media_type="text/event-stream")
+
+@router.get("/jobs/{job_id}/captions-stream")
+async def stream_captions(job_id: str, current_user=Depends(get_current_user)):
+    """
+    Server-Sent Events stream of a meeting's finalized captions (live view).
+
+    Events: `caption` ({speaker, text, timestamp}) for every caption, starting
+    with those finalized before the client connected, then `done` once the
+    recording is over.
+    """
+    await ensure_job_owner(job_id, current_user)
+    return StreamingResponse(stream_live_captions(job_id), media_type="text/event-stream")
+
 # @router.get("/job-status/{job_id}")
 # async def get_job_status(job_id: str):
 #     job = record_meeting_task.AsyncResult(job_id)
@@ -47,6 +93,14 @@ async def get_all_meetings(
     meeting_service = MeetingService(db)
     meetings = await meeting_service.get_user_meetings(current_user.user_id)
     return meetings
+@router.get("/{meeting_id}/playback.m3u8")
+async def get_meeting_playback(meeting_id: UUID, current_user=Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+    """
+    HLS manifest of the meeting recording with presigned segment URLs, for seekable playback.
+    """
+    meeting_service = MeetingService(db)
+    manifest = await meeting_service.get_playback_manifest(meeting_id, current_user.user_id)
+    return Response(content=manifest, media_type="application/vnd.apple.mpegurl")
 @router.get("/{meeting_id}", response_model=MeetingDetails)
 async def get_meeting_details(meeting_id: UUID, current_user=Depends(get_current_user), db: AsyncSession = Depends(get_db)) -> MeetingDetails:
     meeting_service = MeetingService(db)
@@ -87,6 +87,7 @@ class MeetingErrorMessages:
     MEETING_NOT_FOUND = "Meeting not found"
     MEETING_ACCESS_DENIED = "Access to the meeting is denied"
     NO_MEETINGS_FOUND = "No meetings found for the user"
+    PLAYBACK_NOT_FOUND = "No playback manifest was recorded for this meeting"
 # convenience functions for common signup errors
 def raise_invalid_credentials():
     error_info = SignupErrorMessages.INVALID_CREDENTIALS
@@ -22,7 +22,9 @@ class Meeting(Base):
     summary = Column(JSONB, nullable=True)
     merged_transcript = Column(JSONB, nullable=True)
     captions = Column(JSONB, nullable=True)
+    chunk_summaries = Column(JSONB, nullable=True)
     
     audio_object = Column(String, nullable=True)    
+    playback_manifest = Column(String, nullable=True)
     user = relationship("User", back_populates="meetings")
     meeting_date = Column(Date, server_default=func.current_date())
\ No newline at end of file
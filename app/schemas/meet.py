@@ -52,6 +52,7 @@ class MeetingDetails(BaseModel):
     summary: Dict[str, Any] | None
     start_time: datetime | None
     audio_url: str | None = None
+    playback_url: str | None = None
     meet_url: str | None
     model_config = {
         "from_attributes": True 
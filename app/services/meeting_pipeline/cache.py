@@ -0,0 +1,233 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# "sqlite" (default), "redis" or "none"
+SUMMARY_CACHE_BACKEND = os.getenv("SUMMARY_CACHE_BACKEND", "sqlite").lower()
+SUMMARY_CACHE_PATH = os.getenv("SUMMARY_CACHE_PATH", "/tmp/meetings/summary_cache.sqlite3")
+SUMMARY_CACHE_TTL_SECONDS = int(os.getenv("SUMMARY_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+SUMMARY_CACHE_MAX_ENTRIES = int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", "50000"))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+# A hit only refreshes an entry's LRU timestamp when it is older than this,
+# so reads don't turn into writes
+SUMMARY_CACHE_TOUCH_SECONDS = int(os.getenv("SUMMARY_CACHE_TOUCH_SECONDS", "3600"))
+# Expired and over-limit entries are pruned at most this often per process, not on every write
+SUMMARY_CACHE_PRUNE_SECONDS = int(os.getenv("SUMMARY_CACHE_PRUNE_SECONDS", "300"))
+
+
+def prompt_fingerprint(prompt) -> str:
+    """
+    Stable text representation of a ChatPromptTemplate, used as part of the cache key.
+    """
+    templates = []
+    for message in getattr(prompt, "messages", []):
+        inner = getattr(message, "prompt", None)
+        templates.append(getattr(inner, "template", None) or repr(message))
+    return json.dumps(templates) if templates else repr(prompt)
+
+
+def make_cache_key(prompt, model_name: str, text: str) -> str:
+    """
+    Content-addressed key: sha256 over (prompt template, model name, input text).
+    """
+    digest = hashlib.sha256()
+    for part in (prompt_fingerprint(prompt), model_name, text):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class SQLiteCacheBackend:
+    """
+    Local on-disk backend. Entries expire after ttl_seconds and the least
+    recently used entries are evicted once max_entries is exceeded.
+    The connection is opened lazily in each process, so forked workers
+    (Celery prefork) never share one.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: int,
+        max_entries: int,
+        touch_seconds: int = SUMMARY_CACHE_TOUCH_SECONDS,
+        prune_seconds: int = SUMMARY_CACHE_PRUNE_SECONDS,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.touch_seconds = touch_seconds
+        self.prune_seconds = prune_seconds
+        self._last_prune = 0.0
+        self._conn = None
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self) -> None:
+        # The child reconnects on first use; the parent's lock may have been held at fork time
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        This process's connection (call with self._lock held).
+        """
+        if self._conn is not None:
+            return self._conn
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS summary_cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_summary_cache_accessed ON summary_cache (accessed_at)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_summary_cache_created ON summary_cache (created_at)"
+        )
+        self._conn.commit()
+        return self._conn
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT value, created_at, accessed_at FROM summary_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at, accessed_at = row
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                conn.execute("DELETE FROM summary_cache WHERE key = ?", (key,))
+                conn.commit()
+                return None
+            if now - accessed_at > self.touch_seconds:
+                conn.execute("UPDATE summary_cache SET accessed_at = ? WHERE key = ?", (now, key))
+                conn.commit()
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO summary_cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            if now - self._last_prune >= self.prune_seconds:
+                self._prune(conn, now)
+            conn.commit()
+
+    def _prune(self, conn: sqlite3.Connection, now: float) -> None:
+        """
+        Drop expired entries, then the least recently used ones over max_entries
+        (call with self._lock held).
+        """
+        self._last_prune = now
+        if self.ttl_seconds:
+            conn.execute(
+                "DELETE FROM summary_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+        if self.max_entries:
+            conn.execute(
+                "DELETE FROM summary_cache WHERE key IN ("
+                " SELECT key FROM summary_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+
+class RedisCacheBackend:
+    """
+    Shared backend for multiple workers. Entries expire via Redis TTL; size
+    is bounded by the server's maxmemory / eviction policy.
+    """
+
+    def __init__(self, url: str, ttl_seconds: int, prefix: str = "summary_cache:"):
+        import redis  # optional backend, only needed when selected
+
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url, decode_responses=True)
+
+    def get(self, key: str) -> Optional[str]:
+        return self._client.get(self.prefix + key)
+
+    def set(self, key: str, value: str) -> None:
+        self._client.set(self.prefix + key, value, ex=self.ttl_seconds or None)
+
+
+class SummaryCache:
+    """
+    Cache for LLM outputs of the meeting summary pipeline, with hit/miss counters.
+    Backend failures are logged and treated as misses so summarization never breaks.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def _count(self, field: str) -> None:
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def get(self, key: str) -> Optional[str]:
+        if self.backend is None:
+            return None
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            self._count("errors")
+            logger.warning(f"Summary cache read failed: {e}")
+            value = None
+        self._count("hits" if value is not None else "misses")
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        if self.backend is None:
+            return
+        try:
+            self.backend.set(key, value)
+        except Exception as e:
+            self._count("errors")
+            logger.warning(f"Summary cache write failed: {e}")
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "errors": self.errors}
+
+
+def build_summary_cache() -> SummaryCache:
+    """
+    Build the cache configured by SUMMARY_CACHE_BACKEND.
+    """
+    try:
+        if SUMMARY_CACHE_BACKEND == "redis":
+            return SummaryCache(RedisCacheBackend(REDIS_URL, SUMMARY_CACHE_TTL_SECONDS))
+        if SUMMARY_CACHE_BACKEND == "sqlite":
+            return SummaryCache(
+                SQLiteCacheBackend(SUMMARY_CACHE_PATH, SUMMARY_CACHE_TTL_SECONDS, SUMMARY_CACHE_MAX_ENTRIES)
+            )
+    except Exception as e:
+        logger.warning(f"Summary cache disabled, backend '{SUMMARY_CACHE_BACKEND}' unavailable: {e}")
+    return SummaryCache(None)
+
+
+summary_cache = build_summary_cache()
@@ -0,0 +1,167 @@
+import re
+import logging
+
+from .utils import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Pure disfluencies only; words like "like" or "you know" can carry meaning and are kept
+# Hyphenated ones ("mm-hmm", "uh-huh") are matched as whole tokens
+FILLER_PATTERN = re.compile(
+    r"(?<![\w'-])(?:u+h+-h+u+h+|m+-h+m+|u+m+|u+h+|uhm|e+r+m*|a+h+|h+m+|m+h*m+)(?![\w'-])[,.]?",
+    re.IGNORECASE,
+)
+# "I I I think" -> "I think"; only single letters: repeated words ("that that") and
+# numbers ("1 1 2") can be meant
+STUTTER_PATTERN = re.compile(r"\b([^\W\d_])(?:\s+\1\b)+", re.IGNORECASE)
+SPACES_PATTERN = re.compile(r"\s{2,}")
+SPACE_BEFORE_PUNCT_PATTERN = re.compile(r"\s+([,.?!])")
+LINE_PATTERN = re.compile(r"^([^:\n]{1,80}):\s?(.*)$")
+# Legend entries of TranscriptCompactor.legend_text() and aliased chunk lines ("[00:01] S1: ...")
+LEGEND_ENTRY_PATTERN = re.compile(r"(S\d+) = (.*?)(?=, S\d+ = |$)")
+ALIASED_LINE_PATTERN = re.compile(r"^(\[[^\]]*\] )?(S\d+):", re.MULTILINE)
+
+
+def clean_text(text: str) -> str:
+    """
+    Remove filler words and stutters from a caption/utterance text.
+    """
+    text = FILLER_PATTERN.sub("", text)
+    text = STUTTER_PATTERN.sub(r"\1", text)
+    text = SPACE_BEFORE_PUNCT_PATTERN.sub(r"\1", text)
+    text = SPACES_PATTERN.sub(" ", text)
+    return text.strip().lstrip(",.").strip()
+
+
+def _tokens(text: str) -> list[str]:
+    return re.sub(r"[^\w\s]", "", text).lower().split()
+
+
+class TranscriptCompactor:
+    """
+    Shrinks transcript segments before they are sent to an LLM or embedded:
+    - drops empty segments
+    - removes filler words and stutters
+    - drops repeated caption fragments of the same speaker
+    - (optionally) replaces speaker names by short aliases (S1, S2, ...) with a legend
+
+    Aliases are stable for the lifetime of the compactor, so one instance can be
+    fed a meeting window by window.
+    """
+
+    def __init__(self, alias_speakers: bool = True):
+        self.alias_speakers = alias_speakers
+        self.aliases = {}
+        self.tokens_before = 0
+        self.tokens_after = 0
+
+    @property
+    def legend(self) -> dict:
+        """Alias -> real speaker name."""
+        return {alias: name for name, alias in self.aliases.items()}
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+    def speaker_alias(self, name: str) -> str:
+        if not self.alias_speakers:
+            return name
+        if name not in self.aliases:
+            self.aliases[name] = f"S{len(self.aliases) + 1}"
+        return self.aliases[name]
+
+    def legend_text(self, aliases: list = None) -> str:
+        """
+        "Speakers: S1 = Alice Smith, S2 = Bob" for the given aliases (all by default).
+        """
+        legend = self.legend
+        selected = aliases if aliases is not None else list(legend)
+        entries = [f"{alias} = {legend[alias]}" for alias in selected if alias in legend]
+        return f"Speakers: {', '.join(entries)}" if entries else ""
+
+    def compact(self, segments: list[dict]) -> list[dict]:
+        """
+        Return compacted copies of the segments (speaker_name/text/start_time/end_time).
+        """
+        compacted = []
+        for seg in segments:
+            name = seg.get("speaker_name") or "Unknown"
+            raw_text = seg.get("text") or ""
+            self.tokens_before += estimate_tokens(f"{name}: {raw_text}\n")
+
+            text = clean_text(raw_text)
+            if not text:
+                continue
+
+            speaker = self.speaker_alias(name)
+            prev = compacted[-1] if compacted else None
+            if prev and prev["speaker_name"] == speaker:
+                # Compared word by word, so "No" never matches inside "not know"
+                prev_tokens, tokens = _tokens(prev["text"]), _tokens(text)
+                if tokens == prev_tokens[:len(tokens)]:
+                    # Repeated caption fragment
+                    prev["end_time"] = seg.get("end_time") or prev["end_time"]
+                    continue
+                if tokens[:len(prev_tokens)] == prev_tokens:
+                    # Caption was rewritten with more text; keep the longer version only
+                    prev["text"] = text
+                    prev["end_time"] = seg.get("end_time") or prev["end_time"]
+                    continue
+
+            compacted.append({**seg, "speaker_name": speaker, "text": text})
+
+        self.tokens_after += sum(
+            estimate_tokens(f"{seg['speaker_name']}: {seg['text']}\n") for seg in compacted
+        )
+        return compacted
+
+    def stats(self) -> dict:
+        return {
+            "tokens_before": self.tokens_before,
+            "tokens_after": self.tokens_after,
+            "tokens_saved": self.tokens_saved,
+        }
+
+
+def expand_aliases(text: str) -> str:
+    """
+    Text of a summary chunk (legend line + aliased lines) with the real
+    speaker names put back on every line and the legend dropped.
+    """
+    first_line, _, body = text.partition("\n")
+    if not first_line.startswith("Speakers: "):
+        return text
+    legend = dict(LEGEND_ENTRY_PATTERN.findall(first_line[len("Speakers: "):]))
+    return ALIASED_LINE_PATTERN.sub(
+        lambda m: f"{m.group(1) or ''}{legend.get(m.group(2), m.group(2))}:", body
+    )
+
+
+def segments_from_text(transcript_text: str) -> list[dict]:
+    """
+    Parse "Speaker: text" lines (as built by the worker) back into segments.
+    """
+    segments = []
+    for line in transcript_text.splitlines():
+        match = LINE_PATTERN.match(line.strip())
+        if match:
+            segments.append({"speaker_name": match.group(1).strip(), "text": match.group(2)})
+        elif line.strip():
+            segments.append({"speaker_name": "Unknown", "text": line.strip()})
+    return segments
+
+
+def segments_to_text(segments: list[dict]) -> str:
+    return "\n".join(f"{seg['speaker_name']}: {seg['text']}" for seg in segments)
+
+
+def compact_transcript_text(transcript_text: str, alias_speakers: bool = True) -> tuple[str, TranscriptCompactor]:
+    """
+    Compact a "Speaker: text" transcript. Returns the compacted text and the
+    compactor (for the legend and token stats).
+    """
+    compactor = TranscriptCompactor(alias_speakers=alias_speakers)
+    text = segments_to_text(compactor.compact(segments_from_text(transcript_text)))
+    logger.info(f"Transcript compaction: {compactor.stats()}")
+    return text, compactor
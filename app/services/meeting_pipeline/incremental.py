@@ -0,0 +1,175 @@
+import os
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .compaction import TranscriptCompactor
+from .summarizer import (
+    build_summary_chunks,
+    chunk_progress_data,
+    summarize_chunks,
+    ProgressCallback,
+    SUMMARY_MAX_CONCURRENCY,
+)
+from .utils import estimate_tokens, TRANSCRIPT_CHUNK_TOKEN_BUDGET
+
+logger = logging.getLogger(__name__)
+
+INCREMENTAL_SUMMARY_ENABLED = os.getenv("INCREMENTAL_SUMMARY", "true").lower() == "true"
+# How often (seconds) the shared captions are checked for new ones
+INCREMENTAL_POLL_SECONDS = float(os.getenv("INCREMENTAL_POLL_SECONDS", "5"))
+
+
+def caption_to_segment(caption: dict) -> dict:
+    """
+    Convert a finalized caption ({speaker, text, timestamp}) to a transcript segment.
+    """
+    return {
+        "speaker_name": caption.get("speaker") or "Unknown",
+        "text": caption.get("text", ""),
+        "start_time": caption.get("timestamp"),
+        "end_time": caption.get("timestamp"),
+    }
+
+
+class IncrementalSummarizer:
+    """
+    Summarizes finalized captions while the meeting is still being recorded.
+
+    Captions are read from what scrape_captions_json fills: a plain list or a
+    CaptionStream (anything with read(after_id) -> (captions, next_id)). As soon as
+    the pending captions fill a window (token budget), the window is summarized
+    in the background. finish() returns all chunk records in meeting order without
+    waiting for the model; the summarize stage completes the missing summaries.
+    """
+
+    def __init__(
+        self,
+        captions: list,
+        token_budget: int = TRANSCRIPT_CHUNK_TOKEN_BUDGET,
+        poll_interval: float = INCREMENTAL_POLL_SECONDS,
+        max_concurrency: int = SUMMARY_MAX_CONCURRENCY,
+        on_progress: ProgressCallback = None,
+    ):
+        self.captions = captions
+        self.on_progress = on_progress
+        self.token_budget = token_budget
+        self.poll_interval = poll_interval
+        self.compactor = TranscriptCompactor()
+        self._consumed = 0
+        self._cursor = "0-0"
+        self._pending = []
+        self._pending_tokens = 0
+        self._futures = []
+        self._stop = threading.Event()
+        self._thread = None
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_concurrency))
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        logger.info(" Started incremental summarizer")
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self._drain()
+            except Exception as e:
+                logger.warning(f" Incremental summarizer drain failed: {e}")
+
+    def _drain(self):
+        """
+        Move new captions into the pending window and close the window once it is full.
+        """
+        for caption in self._new_captions():
+            segment = caption_to_segment(caption)
+            tokens = estimate_tokens(f"{segment['speaker_name']}: {segment['text']}\n")
+            if self._pending and self._pending_tokens + tokens > self.token_budget:
+                self._close_window()
+            self._pending.append(segment)
+            self._pending_tokens += tokens
+
+    def _new_captions(self) -> list:
+        if isinstance(self.captions, list):
+            new_captions = self.captions[self._consumed:]
+            self._consumed += len(new_captions)
+            return new_captions
+
+        new_captions = []
+        while True:
+            batch, cursor = self.captions.read(self._cursor)
+            if cursor == self._cursor:
+                return new_captions
+            new_captions.extend(batch)
+            self._cursor = cursor
+
+    def _close_window(self, submit: bool = True):
+        if not self._pending:
+            return
+        for chunk in build_summary_chunks(self._pending, self.compactor, self.token_budget):
+            # Windows are numbered in meeting order across the whole recording
+            chunk["chunk_index"] = len(self._futures)
+            future = None
+            if submit:
+                future = self._executor.submit(summarize_chunks, [chunk["text"]], 1)
+                if self.on_progress:
+                    future.add_done_callback(lambda f, chunk=chunk: self._publish(chunk, f))
+            self._futures.append((chunk, future))
+        if submit:
+            logger.info(f" Summarizing caption window {len(self._futures)} in background")
+        self._pending = []
+        self._pending_tokens = 0
+
+    def _publish(self, chunk: dict, future):
+        if not future.cancelled() and future.exception() is None:
+            self.on_progress("chunk_summary", chunk_progress_data(chunk, future.result()[0]))
+
+    def finish(self) -> list[dict]:
+        """
+        Stop watching captions and return all chunk records in meeting order
+        ({chunk_index, text, start_time, end_time, speakers[, summary]}).
+        Does not wait for the model: windows whose summary isn't ready yet (the
+        last, partial one included) come back without "summary", for
+        summarize_pending_chunks() in the summarize stage.
+        """
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self._drain()
+        self._close_window(submit=False)
+
+        chunks = []
+        for chunk, future in self._futures:
+            if future is not None and future.done() and not future.cancelled() and future.exception() is None:
+                chunks.append({**chunk, "summary": future.result()[0]})
+            else:
+                chunks.append(chunk)
+
+        # In-flight calls still fill the summary cache for the summarize stage
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        pending = sum(1 for chunk in chunks if "summary" not in chunk)
+        logger.info(f" Caption windows: {len(chunks) - pending} summarized, {pending} left for the summarize stage")
+        logger.info(f" Caption compaction: {self.compactor.stats()}")
+        return chunks
+
+
+def summarize_pending_chunks(
+    chunks: list[dict],
+    on_progress: ProgressCallback = None,
+    max_concurrency: int = SUMMARY_MAX_CONCURRENCY,
+) -> list[dict]:
+    """
+    Fill in the summaries IncrementalSummarizer.finish() left out.
+    """
+    pending = [idx for idx, chunk in enumerate(chunks) if "summary" not in chunk]
+    if not pending:
+        return chunks
+    chunks = list(chunks)
+
+    def on_result(pos: int, summary: str):
+        chunks[pending[pos]] = {**chunks[pending[pos]], "summary": summary}
+        if on_progress:
+            on_progress("chunk_summary", chunk_progress_data(chunks[pending[pos]], summary))
+
+    summarize_chunks([chunks[idx]["text"] for idx in pending], max_concurrency, on_result=on_result)
+    return chunks
@@ -0,0 +1,120 @@
+import os
+import json
+import time
+import logging
+from typing import AsyncIterator, Optional
+
+import redis
+import redis.asyncio as aioredis
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+# How long progress events of a job are kept for late subscribers
+SUMMARY_PROGRESS_TTL_SECONDS = int(os.getenv("SUMMARY_PROGRESS_TTL_SECONDS", str(24 * 3600)))
+# Seconds between SSE keep-alive comments while no event arrives
+SUMMARY_STREAM_KEEPALIVE_SECONDS = float(os.getenv("SUMMARY_STREAM_KEEPALIVE_SECONDS", "15"))
+
+# Events after which nothing else is published for a job
+TERMINAL_EVENTS = {"done", "error"}
+
+
+def _events_key(job_id: str) -> str:
+    return f"summary_progress:{job_id}"
+
+
+def _owner_key(job_id: str) -> str:
+    return f"summary_progress:{job_id}:owner"
+
+
+class SummaryProgressPublisher:
+    """
+    Publishes partial summary results of a meeting job.
+
+    Every event is appended to a Redis list (so late subscribers can replay it)
+    and announced on a pub/sub channel of the same name (so live subscribers
+    wake up immediately). Publishing failures are logged and never break the pipeline.
+    """
+
+    def __init__(self, job_id: str, client: Optional[redis.Redis] = None):
+        self.job_id = job_id
+        self.key = _events_key(job_id)
+        self._client = client or redis.Redis.from_url(REDIS_URL, decode_responses=True)
+
+    def publish(self, event: str, data: dict) -> None:
+        payload = json.dumps({"event": event, "data": data, "ts": time.time()}, default=str)
+        try:
+            pipe = self._client.pipeline()
+            pipe.rpush(self.key, payload)
+            pipe.expire(self.key, SUMMARY_PROGRESS_TTL_SECONDS)
+            pipe.publish(self.key, event)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to publish summary progress '{event}' for job {self.job_id}: {e}")
+
+    def reset(self) -> None:
+        """
+        Drop the events of a previous run of the job (reprocessing reuses the job id),
+        so subscribers don't replay its terminal event and stop before the new run.
+        """
+        try:
+            self._client.delete(self.key)
+        except Exception as e:
+            logger.warning(f"Failed to reset summary progress of job {self.job_id}: {e}")
+
+    def __call__(self, event: str, data: dict) -> None:
+        self.publish(event, data)
+
+
+async def register_job_owner(job_id: str, user_id: str) -> None:
+    """
+    Remember which user queued the job, so only they can stream its progress.
+    """
+    client = aioredis.Redis.from_url(REDIS_URL, decode_responses=True)
+    try:
+        await client.set(_owner_key(job_id), str(user_id), ex=SUMMARY_PROGRESS_TTL_SECONDS)
+    finally:
+        await client.aclose()
+
+
+async def get_job_owner(job_id: str) -> Optional[str]:
+    client = aioredis.Redis.from_url(REDIS_URL, decode_responses=True)
+    try:
+        return await client.get(_owner_key(job_id))
+    finally:
+        await client.aclose()
+
+
+async def stream_summary_progress(job_id: str) -> AsyncIterator[str]:
+    """
+    Yield the progress events of a job as Server-Sent Events: first the ones
+    already published, then new ones as they arrive, until the job is done.
+    """
+    key = _events_key(job_id)
+    client = aioredis.Redis.from_url(REDIS_URL, decode_responses=True)
+    pubsub = client.pubsub()
+    try:
+        # Subscribe before reading the list so no event falls between the two
+        await pubsub.subscribe(key)
+        next_index = 0
+        while True:
+            raw_events = await client.lrange(key, next_index, -1)
+            next_index += len(raw_events)
+            for raw in raw_events:
+                event = json.loads(raw)
+                yield f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+                if event["event"] in TERMINAL_EVENTS:
+                    return
+
+            message = await pubsub.get_message(
+                ignore_subscribe_messages=True, timeout=SUMMARY_STREAM_KEEPALIVE_SECONDS
+            )
+            if message is None:
+                yield ": keep-alive\n\n"
+    finally:
+        await pubsub.unsubscribe(key)
+        await pubsub.aclose()
+        await client.aclose()
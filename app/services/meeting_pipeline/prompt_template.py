@@ -3,6 +3,8 @@ from langchain.prompts import ChatPromptTemplate
 chunk_prompt = ChatPromptTemplate.from_template(
     """You are an expert meeting assistant.
     Summarize the following transcript chunk into concise notes.
+    Speakers may be written as short aliases (S1, S2, ...); use the "Speakers:" legend
+    at the top of the chunk to refer to them by their real names.
     Include:
     - Timestamps
     - Speaker names
@@ -26,3 +28,17 @@ merge_prompt = ChatPromptTemplate.from_template(
     {chunk_summaries}
     """
 )
+
+reduce_prompt = ChatPromptTemplate.from_template(
+    """You are an expert meeting assistant.
+    The following are consecutive summaries of parts of one meeting.
+    Combine them into a single concise set of notes for this part of the meeting.
+    Keep:
+    - Timestamps
+    - Speaker names
+    - Bullet points for actions or important points
+
+    Summaries:
+    {chunk_summaries}
+    """
+)
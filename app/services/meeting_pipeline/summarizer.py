@@ -1,39 +1,257 @@
+import os
+import json
+import logging
+from typing import Callable, Optional
 from langchain_google_genai import ChatGoogleGenerativeAI
 from dotenv import load_dotenv
+from .cache import summary_cache, make_cache_key
+from .compaction import TranscriptCompactor, compact_transcript_text
 from .meeting_output_schemas import MeetingSummary
-from .prompt_template import chunk_prompt, merge_prompt
-from .utils import chunk_transcript
+from .prompt_template import chunk_prompt, merge_prompt, reduce_prompt
+from .utils import chunk_transcript, chunk_transcript_segments, estimate_tokens, group_by_token_budget
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Max number of chunk summaries requested from Gemini at the same time
+SUMMARY_MAX_CONCURRENCY = int(os.getenv("SUMMARY_MAX_CONCURRENCY", "8"))
+# Max estimated tokens of chunk summaries sent to a single merge call
+SUMMARY_MERGE_TOKEN_BUDGET = int(os.getenv("SUMMARY_MERGE_TOKEN_BUDGET", "6000"))
+
+MODEL_NAME = "gemini-2.5-flash"
+
 # Initialize the Google Gemini Pro model
-model = ChatGoogleGenerativeAI(model="gemini-2.5-flash")
+model = ChatGoogleGenerativeAI(model=MODEL_NAME)
 
 # Wrap model to enforce structured output with MeetingSummary
 structured_model = model.with_structured_output(MeetingSummary)
 
+# Called as on_progress(event, data) whenever a partial result is ready
+ProgressCallback = Optional[Callable[[str, dict], None]]
+
+
+def run_cached_batch(
+    prompt,
+    input_key: str,
+    texts: list[str],
+    max_concurrency: int = SUMMARY_MAX_CONCURRENCY,
+    on_result: Optional[Callable[[int, str], None]] = None,
+) -> list[str]:
+    """
+    Run prompt | model over texts concurrently.
+    Texts already in the summary cache are not sent to the model again.
+    on_result(index, output) is called as soon as each output is available.
+    Results are returned in the same order as the input texts.
+    """
+    keys = [make_cache_key(prompt, MODEL_NAME, text) for text in texts]
+    results = [summary_cache.get(key) for key in keys]
+    missing = [idx for idx, result in enumerate(results) if result is None]
+
+    if on_result:
+        for idx, result in enumerate(results):
+            if result is not None:
+                on_result(idx, result)
+
+    if missing:
+        chain = prompt | model
+        # batch_as_completed() fans out over a bounded thread pool; outputs are put
+        # back at their input position so the caller still gets them in order
+        outputs = chain.batch_as_completed(
+            [{input_key: texts[idx]} for idx in missing],
+            config={"max_concurrency": max(1, max_concurrency)},
+        )
+        for pos, output in outputs:
+            if isinstance(output, Exception):
+                raise output
+            idx = missing[pos]
+            results[idx] = output.content
+            summary_cache.set(keys[idx], output.content)
+            if on_result:
+                on_result(idx, output.content)
+
+    return results
+
+
+def summarize_chunks(
+    chunks: list[str],
+    max_concurrency: int = SUMMARY_MAX_CONCURRENCY,
+    on_result: Optional[Callable[[int, str], None]] = None,
+) -> list[str]:
+    """
+    Summarize transcript chunks concurrently, in input order.
+    """
+    return run_cached_batch(chunk_prompt, "transcript_chunk", chunks, max_concurrency, on_result)
+
+
+def chunk_progress_data(chunk: dict, summary: str) -> dict:
+    """
+    Payload of a "chunk_summary" progress event.
+    """
+    return {
+        "chunk_index": chunk["chunk_index"],
+        "start_time": chunk["start_time"],
+        "end_time": chunk["end_time"],
+        "speakers": chunk["speakers"],
+        "summary": summary,
+    }
+
+
+def build_summary_chunks(segments: list[dict], compactor: TranscriptCompactor, token_budget: int = None) -> list[dict]:
+    """
+    Compact segments and pack them into speaker-turn chunks.
+    Each chunk's text starts with the legend of the speaker aliases it uses,
+    and its "speakers" list holds the real names.
+    """
+    compacted = compactor.compact(segments)
+    if token_budget is None:
+        chunks = chunk_transcript_segments(compacted)
+    else:
+        chunks = chunk_transcript_segments(compacted, token_budget)
+
+    legend = compactor.legend
+    for chunk in chunks:
+        legend_text = compactor.legend_text(chunk["speakers"])
+        if legend_text:
+            chunk["text"] = f"{legend_text}\n{chunk['text']}"
+        chunk["speakers"] = [legend.get(alias, alias) for alias in chunk["speakers"]]
+    return chunks
+
 
-def generate_meeting_summary(transcript_text: str) -> dict:
+def summarize_segment_chunks(
+    segments: list[dict],
+    max_concurrency: int = SUMMARY_MAX_CONCURRENCY,
+    on_progress: ProgressCallback = None,
+) -> list[dict]:
+    """
+    Compact merged transcript segments, chunk them by speaker turns and summarize each chunk.
+    Each returned chunk dict carries its time range and a "summary" key.
+    """
+    compactor = TranscriptCompactor()
+    chunks = build_summary_chunks(segments, compactor)
+    logger.info(f"Transcript compaction: {compactor.stats()}")
+
+    on_result = None
+    if on_progress:
+        on_result = lambda idx, summary: on_progress("chunk_summary", chunk_progress_data(chunks[idx], summary))
+    summaries = summarize_chunks([chunk["text"] for chunk in chunks], max_concurrency, on_result)
+    return [{**chunk, "summary": summary} for chunk, summary in zip(chunks, summaries)]
+
+
+def format_chunk_summary(chunk: dict) -> str:
+    """
+    Prefix a chunk summary with its real time range so the merge can fill NoteItem start/end times.
+    """
+    return f"[{chunk['start_time']} - {chunk['end_time']}]\n{chunk['summary']}"
+
+
+def reduce_chunk_summaries(
+    chunk_summaries: list[str],
+    token_budget: int = SUMMARY_MERGE_TOKEN_BUDGET,
+    max_concurrency: int = SUMMARY_MAX_CONCURRENCY,
+    on_progress: ProgressCallback = None,
+) -> MeetingSummary:
+    """
+    Multi-level reduce:
+    while the summaries don't fit in token_budget, merge groups of consecutive
+    summaries (each group sized to the budget, all groups of a level in parallel),
+    then run the final structured merge.
+    """
+    summaries = list(chunk_summaries)
+    level = 0
+    while len(summaries) > 1 and estimate_tokens("\n".join(summaries)) > token_budget:
+        groups = group_by_token_budget(summaries, token_budget)
+        if len(groups) == len(summaries):
+            # Every summary fills the budget on its own; pair them so each level still shrinks
+            groups = [summaries[i:i + 2] for i in range(0, len(summaries), 2)]
+        level += 1
+        logger.info(f"Reduce level {level}: {len(summaries)} summaries -> {len(groups)} groups")
+        on_result = None
+        if on_progress:
+            on_result = lambda idx, summary, level=level: on_progress(
+                "reduce_summary", {"level": level, "index": idx, "summary": summary}
+            )
+        summaries = run_cached_batch(
+            reduce_prompt, "chunk_summaries", ["\n".join(group) for group in groups], max_concurrency, on_result
+        )
+
+    return merge_chunk_summaries(summaries)
+
+
+def merge_chunk_summaries(chunk_summaries: list[str]) -> MeetingSummary:
+    """
+    Merge chunk summaries into the structured MeetingSummary (cached).
+    """
+    merge_input = "\n".join(chunk_summaries)
+    key = make_cache_key(merge_prompt, MODEL_NAME, merge_input)
+    cached = summary_cache.get(key)
+    if cached is not None:
+        return MeetingSummary.model_validate_json(cached)
+
+    merge_chain = merge_prompt | structured_model
+    merged_summary = merge_chain.invoke({"chunk_summaries": merge_input})
+    summary_cache.set(key, json.dumps(merged_summary.model_dump()))
+    return merged_summary
+
+
+def generate_meeting_summary(transcript_text: str, max_concurrency: int = SUMMARY_MAX_CONCURRENCY) -> dict:
     """
     Full pipeline:
-    1. Chunk Transcript
-    2. Summarize each chunk
+    1. Compact (speaker aliases, no fillers/duplicates) and chunk Transcript
+    2. Summarize each chunk (concurrently, up to max_concurrency in flight)
     3. Merge summaries into Overview, Notes, Action Items
+       (intermediate merges first when they exceed the token budget)
     4. Return structured JSON dict
     """
-    # Step 1: Chunk Transcript
-    chunks = chunk_transcript(transcript_text)
-    chunk_summaries = []
+    # Step 1: Compact and chunk Transcript
+    compacted_text, compactor = compact_transcript_text(transcript_text)
+    legend_text = compactor.legend_text()
+    chunks = [f"{legend_text}\n{chunk}" if legend_text else chunk for chunk in chunk_transcript(compacted_text)]
 
     # Step 2: Summarize each chunk
-    chunk_chain = chunk_prompt | model
-    for chunk in chunks:
-        summary = chunk_chain.invoke({"transcript_chunk": chunk})
-        chunk_summaries.append(summary.content)
+    chunk_summaries = summarize_chunks(chunks, max_concurrency=max_concurrency)
 
-    # Step 3: Merge chunk summaries into structured output
-    merge_chain = merge_prompt | structured_model
-    merged_summary = merge_chain.invoke({"chunk_summaries": "\n".join(chunk_summaries)})
+    # Step 3: Merge chunk summaries (hierarchically if needed) into structured output
+    merged_summary = reduce_chunk_summaries(chunk_summaries, max_concurrency=max_concurrency)
+    logger.info(f"Summary cache stats: {summary_cache.stats()}")
 
     # Step 4: Return dict (Pydantic model → dict)
     return merged_summary.model_dump()
+
+
+def generate_meeting_summary_from_chunks(
+    chunks: list[dict],
+    max_concurrency: int = SUMMARY_MAX_CONCURRENCY,
+    on_progress: ProgressCallback = None,
+) -> dict:
+    """
+    Reduce already summarized chunk records (see summarize_segment_chunks and
+    IncrementalSummarizer) into the structured summary dict.
+    """
+    merged_summary = reduce_chunk_summaries(
+        [format_chunk_summary(chunk) for chunk in chunks],
+        max_concurrency=max_concurrency,
+        on_progress=on_progress,
+    )
+    logger.info(f"Summary cache stats: {summary_cache.stats()}")
+    summary = merged_summary.model_dump()
+    if on_progress:
+        on_progress("summary", summary)
+    return summary
+
+
+def generate_meeting_summary_from_segments(
+    segments: list[dict],
+    max_concurrency: int = SUMMARY_MAX_CONCURRENCY,
+    on_progress: ProgressCallback = None,
+) -> dict:
+    """
+    Same pipeline as generate_meeting_summary, but chunks the merged transcript
+    segments by whole speaker turns under a token budget and passes each chunk's
+    time range to the merge step.
+    on_progress(event, data) receives each chunk summary, intermediate reduce
+    result and the final summary as soon as they are ready.
+    """
+    chunks = summarize_segment_chunks(segments, max_concurrency=max_concurrency, on_progress=on_progress)
+    logger.info(f"Summarized {len(chunks)} speaker-turn chunks")
+    return generate_meeting_summary_from_chunks(chunks, max_concurrency=max_concurrency, on_progress=on_progress)
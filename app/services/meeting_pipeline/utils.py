@@ -1,6 +1,9 @@
-
+import os
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
+# Max estimated tokens per chunk built from speaker turns
+TRANSCRIPT_CHUNK_TOKEN_BUDGET = int(os.getenv("TRANSCRIPT_CHUNK_TOKEN_BUDGET", "1500"))
+
 
 def chunk_transcript(transcript_text:str, chunk_size=1000,chunk_overlap=100):
     """
@@ -9,4 +12,122 @@ def chunk_transcript(transcript_text:str, chunk_size=1000,chunk_overlap=100):
     splitter = RecursiveCharacterTextSplitter(
         chunk_size=chunk_size,
         chunk_overlap=chunk_overlap)
-    return splitter.split_text(transcript_text)
\ No newline at end of file
+    return splitter.split_text(transcript_text)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap token estimate (~4 characters per token) that needs no tokenizer or API call.
+    """
+    return (len(text) + 3) // 4
+
+
+def group_by_token_budget(texts: list[str], token_budget: int) -> list[list[str]]:
+    """
+    Group consecutive texts so that each group stays within token_budget.
+    A single text larger than the budget gets a group of its own.
+    """
+    groups = []
+    current = []
+    current_tokens = 0
+    for text in texts:
+        tokens = estimate_tokens(text)
+        if current and current_tokens + tokens > token_budget:
+            groups.append(current)
+            current = []
+            current_tokens = 0
+        current.append(text)
+        current_tokens += tokens
+    if current:
+        groups.append(current)
+    return groups
+
+
+def _split_turn_text(text: str, token_budget: int) -> list[str]:
+    """
+    Split a single oversized speaker turn on word boundaries so each piece fits token_budget.
+    """
+    pieces = []
+    current = []
+    current_tokens = 0
+    for word in text.split():
+        tokens = estimate_tokens(word + " ")
+        if current and current_tokens + tokens > token_budget:
+            pieces.append(" ".join(current))
+            current = []
+            current_tokens = 0
+        current.append(word)
+        current_tokens += tokens
+    if current:
+        pieces.append(" ".join(current))
+    return pieces
+
+
+def build_speaker_turns(segments: list[dict]) -> list[dict]:
+    """
+    Collapse consecutive segments of the same speaker into one turn.
+    Accepts merged transcript segments (speaker_name/text/start_time/end_time).
+    """
+    turns = []
+    for seg in segments:
+        text = (seg.get("text") or "").strip()
+        if not text:
+            continue
+        speaker = seg.get("speaker_name") or "Unknown"
+        start_time = seg.get("start_time")
+        end_time = seg.get("end_time") or start_time
+        if turns and turns[-1]["speaker"] == speaker:
+            turns[-1]["text"] += " " + text
+            turns[-1]["end_time"] = end_time
+        else:
+            turns.append({"speaker": speaker, "text": text, "start_time": start_time, "end_time": end_time})
+    return turns
+
+
+def chunk_transcript_segments(segments: list[dict], token_budget: int = TRANSCRIPT_CHUNK_TOKEN_BUDGET) -> list[dict]:
+    """
+    Pack whole speaker turns into chunks of up to token_budget estimated tokens, without overlap.
+    A turn is only split (on word boundaries) when it doesn't fit in a chunk on its own.
+
+    Returns a list of dicts:
+    {"chunk_index", "text", "start_time", "end_time", "speakers"}
+    """
+    chunks = []
+    lines = []
+    tokens_used = 0
+    chunk_start = chunk_end = None
+    speakers = []
+
+    def flush():
+        nonlocal lines, tokens_used, chunk_start, chunk_end, speakers
+        if lines:
+            chunks.append({
+                "chunk_index": len(chunks),
+                "text": "\n".join(lines),
+                "start_time": chunk_start,
+                "end_time": chunk_end,
+                "speakers": speakers,
+            })
+        lines, tokens_used, chunk_start, chunk_end, speakers = [], 0, None, None, []
+
+    for turn in build_speaker_turns(segments):
+        prefix = f"[{turn['start_time']}] {turn['speaker']}: "
+        line = prefix + turn["text"]
+        pieces = [line]
+        if estimate_tokens(line) > token_budget:
+            pieces = [prefix + piece for piece in _split_turn_text(turn["text"], token_budget - estimate_tokens(prefix))]
+
+        for piece in pieces:
+            piece_tokens = estimate_tokens(piece + "\n")
+            if lines and tokens_used + piece_tokens > token_budget:
+                flush()
+            if chunk_start is None:
+                chunk_start = turn["start_time"]
+            chunk_end = turn["end_time"]
+            if turn["speaker"] not in speakers:
+                speakers.append(turn["speaker"])
+            lines.append(piece)
+            tokens_used += piece_tokens
+
+    flush()
+    return chunks
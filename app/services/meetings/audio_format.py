@@ -0,0 +1,76 @@
+import os
+import logging
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+# "opus": Opus in OGG, ~10x smaller than PCM, for storage and playback (default)
+# "flac": lossless, ~2x smaller than PCM
+# "wav":  raw 16 kHz PCM as before
+RECORDING_FORMAT = os.getenv("RECORDING_FORMAT", "opus").lower()
+# Opus bitrate; 24k is transparent for speech at 16 kHz mono
+RECORDING_BITRATE = os.getenv("RECORDING_BITRATE", "24k")
+# Also write HLS segments + manifest so players can seek without fetching the whole file
+PLAYBACK_SEGMENTS_ENABLED = os.getenv("PLAYBACK_SEGMENTS", "false").lower() == "true"
+PLAYBACK_SEGMENT_SECONDS = int(os.getenv("PLAYBACK_SEGMENT_SECONDS", "10"))
+
+PLAYBACK_DIR = "playback"
+PLAYBACK_MANIFEST = "index.m3u8"
+
+AUDIO_FORMATS = {
+    "opus": {
+        "extension": "ogg",
+        "codec": ["-c:a", "libopus", "-b:a", RECORDING_BITRATE, "-application", "voip"],
+    },
+    "flac": {"extension": "flac", "codec": ["-c:a", "flac"]},
+    "wav": {"extension": "wav", "codec": ["-c:a", "pcm_s16le"]},
+}
+
+MIMETYPES = {
+    "ogg": "audio/ogg",
+    "flac": "audio/flac",
+    "wav": "audio/wav",
+    "m3u8": "application/vnd.apple.mpegurl",
+    "mp4": "audio/mp4",
+    "m4s": "audio/mp4",
+}
+
+
+def audio_format(name: str = None) -> dict:
+    name = (name or RECORDING_FORMAT).lower()
+    if name not in AUDIO_FORMATS:
+        logger.warning(f" Unknown recording format {name!r}, recording WAV")
+        name = "wav"
+    return AUDIO_FORMATS[name]
+
+
+def recording_filename(name: str = None) -> str:
+    return f"meeting_audio.{audio_format(name)['extension']}"
+
+
+def codec_args(name: str = None) -> List[str]:
+    return list(audio_format(name)["codec"])
+
+
+def audio_mimetype(path: str) -> str:
+    extension = os.path.splitext(path)[1].lstrip(".").lower()
+    return MIMETYPES.get(extension, "application/octet-stream")
+
+
+def playback_args(playback_dir: str, segment_seconds: int = PLAYBACK_SEGMENT_SECONDS) -> List[str]:
+    """
+    ffmpeg output options for a VOD HLS rendition (AAC in fMP4 segments, which
+    every browser player supports) in playback_dir.
+    """
+    return [
+        "-ac", "1",
+        "-ar", "16000",
+        "-c:a", "aac",
+        "-b:a", "32k",
+        "-f", "hls",
+        "-hls_time", str(segment_seconds),
+        "-hls_playlist_type", "vod",
+        "-hls_segment_type", "fmp4",
+        "-hls_segment_filename", os.path.join(playback_dir, "segment_%05d.m4s"),
+        os.path.join(playback_dir, PLAYBACK_MANIFEST),
+    ]
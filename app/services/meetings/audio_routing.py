@@ -0,0 +1,159 @@
+import os
+import re
+import uuid
+import logging
+import threading
+import subprocess
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Give every bot session its own PulseAudio null sink ("false" = shared meet_sink)
+BOT_AUDIO_ISOLATION = os.getenv("BOT_AUDIO_ISOLATION", "true").lower() == "true"
+SHARED_SINK_NAME = os.getenv("SHARED_SINK_NAME", "meet_sink")
+
+# "Event 'new' on sink-input #42"
+SINK_INPUT_EVENT = re.compile(r"Event '(new|change)' on sink-input #(\d+)")
+PROPERTY_LINE = re.compile(r'^([\w.]+) = "(.*)"$')
+
+CHROME_APPLICATION_NAMES = {"Google Chrome", "Chromium"}
+
+
+def list_sink_inputs() -> dict:
+    """
+    Sink input index -> its properties (application.name, application.process.id, ...).
+    """
+    output = subprocess.check_output(["pactl", "list", "sink-inputs"]).decode()
+    inputs = {}
+    current = None
+    for line in output.splitlines():
+        line = line.strip()
+        if line.startswith("Sink Input #"):
+            current = {}
+            inputs[line.split("#")[1]] = current
+        elif current is not None:
+            match = PROPERTY_LINE.match(line)
+            if match:
+                current[match.group(1)] = match.group(2)
+    return inputs
+
+
+def is_bot_stream(props: dict, pids: Optional[set]) -> bool:
+    """
+    With known Chrome pids only that browser's streams match, so concurrent bots
+    never grab each other's audio. Without pids, fall back to any Chrome stream.
+    """
+    if pids is not None:
+        pid = props.get("application.process.id", "")
+        return pid.isdigit() and int(pid) in pids
+    return (
+        props.get("application.name") in CHROME_APPLICATION_NAMES
+        or props.get("application.process.binary") == "chrome"
+        or props.get("media.name") == "WebRTC Voice"
+    )
+
+
+class BotAudioSink:
+    """
+    A PulseAudio null sink owned by one bot session.
+
+    start() creates the sink and follows `pactl subscribe` events, moving every
+    new audio stream of the bot's Chrome processes into it as soon as it appears
+    (no polling). ffmpeg records from `monitor`. close() stops following and
+    unloads the sink.
+
+    browser_pids is called on every event: Chrome opens audio from a utility
+    process that may only be spawned once the meeting starts playing.
+    """
+
+    def __init__(self, browser_pids: Optional[Callable[[], set]] = None, sink_name: Optional[str] = None):
+        self.browser_pids = browser_pids
+        self.sink_name = sink_name or f"bot_{uuid.uuid4().hex[:8]}"
+        self.module_index = None
+        self.moved_inputs = set()
+        self.stream_found = threading.Event()
+        self._subscriber = None
+        self._follower = None
+
+    @property
+    def monitor(self) -> str:
+        return f"{self.sink_name}.monitor"
+
+    def start(self) -> "BotAudioSink":
+        # Step 1 — Create the per-session sink
+        self.module_index = subprocess.check_output([
+            "pactl", "load-module", "module-null-sink",
+            f"sink_name={self.sink_name}",
+            f"sink_properties=device.description={self.sink_name}",
+        ]).decode().strip()
+        logger.info(f" Created audio sink {self.sink_name} (module {self.module_index})")
+
+        # Step 2 — Subscribe before scanning so a stream created in between isn't missed
+        self._subscriber = subprocess.Popen(
+            ["pactl", "subscribe"], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+        )
+        self._follower = threading.Thread(target=self._follow_events, daemon=True)
+        self._follower.start()
+
+        # Step 3 — Streams that already exist (e.g. a warm browser that is still playing)
+        for index, props in list_sink_inputs().items():
+            if is_bot_stream(props, self._pids()):
+                self._move(index)
+        return self
+
+    def _follow_events(self):
+        for line in self._subscriber.stdout:
+            match = SINK_INPUT_EVENT.search(line)
+            if not match or match.group(2) in self.moved_inputs:
+                continue
+            try:
+                props = list_sink_inputs().get(match.group(2))
+            except Exception as e:
+                logger.warning(f" Could not inspect sink-input #{match.group(2)}: {e}")
+                continue
+            if props and is_bot_stream(props, self._pids()):
+                self._move(match.group(2))
+
+    def _pids(self) -> Optional[set]:
+        return set(self.browser_pids()) if self.browser_pids else None
+
+    def _move(self, index: str):
+        if index in self.moved_inputs:
+            return
+        if subprocess.call(["pactl", "move-sink-input", index, self.sink_name]) == 0:
+            self.moved_inputs.add(index)
+            self.stream_found.set()
+            logger.info(f" Moved Chrome/Meet stream {index} to {self.sink_name}")
+
+    def close(self):
+        if self._subscriber:
+            self._subscriber.terminate()
+            try:
+                self._subscriber.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._subscriber.kill()
+        if self._follower:
+            self._follower.join(timeout=5)
+        if self.module_index and not self.stream_found.is_set():
+            logger.warning(f" No Chrome/Meet stream ever reached {self.sink_name}, recording is silent")
+        if self.module_index:
+            # Streams still attached fall back to the default sink
+            subprocess.call(["pactl", "unload-module", self.module_index])
+            logger.info(f" Removed audio sink {self.sink_name}")
+        self.module_index = None
+
+
+def open_bot_audio_sink(browser_pids: Optional[Callable[[], set]] = None) -> Optional[BotAudioSink]:
+    """
+    Per-session sink for a bot, or None when isolation is disabled or the sink
+    can't be created (callers then use the shared meet_sink).
+    """
+    if not BOT_AUDIO_ISOLATION:
+        return None
+    sink = BotAudioSink(browser_pids)
+    try:
+        return sink.start()
+    except Exception as e:
+        logger.error(f" Could not create per-bot audio sink, using {SHARED_SINK_NAME}: {e}")
+        sink.close()
+        return None
@@ -0,0 +1,260 @@
+import os
+import time
+import queue
+import atexit
+import logging
+import threading
+from typing import Optional
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+# Number of pre-launched Chrome instances per worker process (0 = fresh Chrome per meeting)
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "1"))
+BROWSER_PROFILE_ROOT = os.getenv("BROWSER_PROFILE_ROOT", "/tmp/meetings/chrome_profiles")
+# Recycle a browser after this many meetings or once it uses more memory than this
+BROWSER_MAX_SESSIONS = int(os.getenv("BROWSER_MAX_SESSIONS", "20"))
+BROWSER_MAX_RSS_MB = int(os.getenv("BROWSER_MAX_RSS_MB", "1500"))
+BROWSER_ACQUIRE_TIMEOUT = float(os.getenv("BROWSER_ACQUIRE_TIMEOUT", "60"))
+# Seconds between CPU/RSS samples of a bot's browser while it records
+BROWSER_MONITOR_INTERVAL = float(os.getenv("BROWSER_MONITOR_INTERVAL", "5"))
+
+
+def browser_processes(driver) -> list:
+    """
+    chromedriver and every Chrome process started by it.
+    """
+    try:
+        root = psutil.Process(driver.service.process.pid)
+        return [root] + root.children(recursive=True)
+    except (psutil.Error, AttributeError):
+        return []
+
+
+def browser_rss_mb(driver) -> float:
+    total = 0
+    for proc in browser_processes(driver):
+        try:
+            total += proc.memory_info().rss
+        except psutil.Error:
+            pass
+    return total / (1024 * 1024)
+
+
+class BrowserResourceMonitor:
+    """
+    Samples CPU and RSS of one bot's chromedriver + Chrome process tree in a
+    background thread. stop() returns averages and peaks, so bot modes can be
+    compared per meeting.
+    """
+
+    def __init__(self, driver, interval: float = BROWSER_MONITOR_INTERVAL):
+        self.driver = driver
+        self.interval = interval
+        self.cpu_samples = []
+        self.rss_samples = []
+        self._procs = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> "BrowserResourceMonitor":
+        self.sample()  # primes cpu_percent
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def sample(self):
+        cpu_percent = 0.0
+        rss = 0
+        procs = {}
+        for proc in browser_processes(self.driver):
+            # Reuse Process objects so cpu_percent measures since the last sample
+            proc = self._procs.get(proc.pid, proc)
+            try:
+                cpu_percent += proc.cpu_percent(None)
+                rss += proc.memory_info().rss
+            except psutil.Error:
+                continue
+            procs[proc.pid] = proc
+        if self._procs:
+            self.cpu_samples.append(cpu_percent)
+            self.rss_samples.append(rss / (1024 * 1024))
+        self._procs = procs
+
+    def stop(self) -> dict:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval + 1)
+        if not self.cpu_samples:
+            return {"samples": 0}
+        return {
+            "samples": len(self.cpu_samples),
+            "processes": len(self._procs),
+            "cpu_avg_percent": round(sum(self.cpu_samples) / len(self.cpu_samples), 1),
+            "cpu_peak_percent": round(max(self.cpu_samples), 1),
+            "rss_avg_mb": round(sum(self.rss_samples) / len(self.rss_samples), 1),
+            "rss_peak_mb": round(max(self.rss_samples), 1),
+        }
+
+
+class BrowserSlot:
+    """
+    One pool slot: a Chrome instance with its own profile directory.
+    """
+
+    def __init__(self, index: int, profile_dir: str):
+        self.index = index
+        self.profile_dir = profile_dir
+        self.driver = None
+        self.sessions = 0
+
+    def launch(self):
+        from app.services.meetings.join_meeting import setup_chrome
+
+        started = time.monotonic()
+        self.driver = setup_chrome(profile_dir=self.profile_dir)
+        self.sessions = 0
+        logger.info(f" Browser slot {self.index} launched in {time.monotonic() - started:.1f}s")
+
+    def quit(self):
+        if self.driver:
+            try:
+                self.driver.quit()
+            except Exception as e:
+                logger.warning(f" Browser slot {self.index} did not quit cleanly: {e}")
+        self.driver = None
+
+    def is_healthy(self) -> bool:
+        try:
+            return self.driver is not None and self.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def reset(self):
+        """
+        Leave the browser as a fresh session: one blank tab, no cookies from the last meeting.
+        """
+        handles = self.driver.window_handles
+        for handle in handles[1:]:
+            self.driver.switch_to.window(handle)
+            self.driver.close()
+        self.driver.switch_to.window(handles[0])
+        self.driver.get("about:blank")
+        self.driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+
+
+class BrowserPool:
+    """
+    Pre-launched Chrome instances for meeting bots.
+
+    Each slot has an isolated profile directory, so several bots can run on one
+    host. acquire() hands out a warm, health-checked browser; release() resets it
+    and recycles it (relaunch in the background) after max_sessions meetings or
+    when its process tree exceeds max_rss_mb.
+    """
+
+    def __init__(
+        self,
+        size: int = BROWSER_POOL_SIZE,
+        profile_root: str = BROWSER_PROFILE_ROOT,
+        max_sessions: int = BROWSER_MAX_SESSIONS,
+        max_rss_mb: int = BROWSER_MAX_RSS_MB,
+    ):
+        self.size = size
+        self.max_sessions = max_sessions
+        self.max_rss_mb = max_rss_mb
+        self.slots = [
+            BrowserSlot(idx, os.path.join(profile_root, f"slot_{os.getpid()}_{idx}"))
+            for idx in range(size)
+        ]
+        self._idle = queue.Queue()
+
+    def start(self):
+        """
+        Launch all slots in parallel.
+        """
+        threads = [threading.Thread(target=self._launch_into_pool, args=(slot,), daemon=True) for slot in self.slots]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def _launch_into_pool(self, slot: BrowserSlot):
+        try:
+            os.makedirs(slot.profile_dir, exist_ok=True)
+            slot.launch()
+        except Exception as e:
+            logger.error(f" Failed to launch browser slot {slot.index}: {e}")
+            slot.driver = None
+        # Unlaunched slots are still queued and relaunched on acquire
+        self._idle.put(slot)
+
+    def acquire(self, timeout: float = BROWSER_ACQUIRE_TIMEOUT) -> BrowserSlot:
+        slot = self._idle.get(timeout=timeout)
+        if not slot.is_healthy():
+            logger.warning(f" Browser slot {slot.index} unhealthy, relaunching")
+            slot.quit()
+            try:
+                slot.launch()
+            except Exception:
+                self._idle.put(slot)
+                raise
+        slot.sessions += 1
+        return slot
+
+    def release(self, slot: BrowserSlot):
+        rss_mb = browser_rss_mb(slot.driver) if slot.driver else 0
+        if slot.sessions >= self.max_sessions or rss_mb > self.max_rss_mb or not slot.is_healthy():
+            logger.info(
+                f" Recycling browser slot {slot.index} (sessions={slot.sessions}, rss={rss_mb:.0f}MB)"
+            )
+            slot.quit()
+            threading.Thread(target=self._launch_into_pool, args=(slot,), daemon=True).start()
+            return
+        try:
+            slot.reset()
+        except Exception as e:
+            logger.warning(f" Browser slot {slot.index} reset failed, recycling: {e}")
+            slot.quit()
+            threading.Thread(target=self._launch_into_pool, args=(slot,), daemon=True).start()
+            return
+        self._idle.put(slot)
+
+    def shutdown(self):
+        for slot in self.slots:
+            slot.quit()
+
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> Optional[BrowserPool]:
+    """
+    Process-wide pool, created (and pre-launched) on first use. None when BROWSER_POOL_SIZE is 0.
+    """
+    global _pool
+    if BROWSER_POOL_SIZE <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+            _pool.start()
+            # Workers also call this on worker_shutdown; quitting twice is harmless
+            atexit.register(shutdown_browser_pool)
+    return _pool
+
+
+def shutdown_browser_pool() -> None:
+    """
+    Quit the pooled Chrome and chromedriver processes, if the pool was created.
+    """
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            logger.info(" Browser pool shut down")
@@ -0,0 +1,122 @@
+import os
+import json
+import logging
+from typing import AsyncIterator, Iterator, Optional
+
+import redis
+import redis.asyncio as aioredis
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+# Captions must outlive retries and reprocessing of the job's later stages
+CAPTION_STREAM_TTL_SECONDS = int(os.getenv("CAPTION_STREAM_TTL_SECONDS", str(7 * 24 * 3600)))
+CAPTION_STREAM_BATCH = int(os.getenv("CAPTION_STREAM_BATCH", "500"))
+# Seconds a live reader blocks on XREAD before sending an SSE keep-alive
+CAPTION_STREAM_KEEPALIVE_SECONDS = float(os.getenv("CAPTION_STREAM_KEEPALIVE_SECONDS", "15"))
+
+# Field of the entry written when the recording is over
+END_MARKER = "end"
+
+
+def caption_stream_key(job_id: str) -> str:
+    return f"captions:{job_id}"
+
+
+def _entry_to_caption(fields: dict) -> dict:
+    return {"speaker": fields["speaker"], "text": fields["text"], "timestamp": fields["timestamp"]}
+
+
+class CaptionStream:
+    """
+    Finalized captions of one meeting job in a Redis stream.
+
+    The caption scraper appends to it like a list, so captions are persisted as
+    soon as they are finalized and never pile up in worker memory. Later stages
+    iterate the stream in batches; live readers follow it with XREAD.
+    """
+
+    def __init__(self, job_id: str, client: Optional[redis.Redis] = None):
+        self.job_id = job_id
+        self.key = caption_stream_key(job_id)
+        self._client = client or redis.Redis.from_url(REDIS_URL, decode_responses=True)
+
+    def append(self, caption: dict) -> None:
+        pipe = self._client.pipeline()
+        pipe.xadd(self.key, {
+            "speaker": caption["speaker"],
+            "text": caption["text"],
+            "timestamp": caption["timestamp"],
+        })
+        pipe.expire(self.key, CAPTION_STREAM_TTL_SECONDS)
+        pipe.execute()
+
+    def close(self) -> None:
+        """
+        Mark the end of the recording for live readers.
+        """
+        self._client.xadd(self.key, {END_MARKER: "1"})
+        self._client.expire(self.key, CAPTION_STREAM_TTL_SECONDS)
+
+    def clear(self) -> None:
+        self._client.delete(self.key)
+
+    def exists(self) -> bool:
+        """
+        False once the stream expired (a closed stream always holds its end marker).
+        """
+        return bool(self._client.exists(self.key))
+
+    def __len__(self) -> int:
+        return self._client.xlen(self.key)
+
+    def read(self, after_id: str = "0-0", count: int = CAPTION_STREAM_BATCH) -> tuple[list[dict], str]:
+        """
+        Captions added after after_id and the id to continue from.
+        """
+        captions = []
+        entries = self._client.xrange(self.key, min=f"({after_id}", count=count)
+        for entry_id, fields in entries:
+            after_id = entry_id
+            if END_MARKER not in fields:
+                captions.append(_entry_to_caption(fields))
+        return captions, after_id
+
+    def __iter__(self) -> Iterator[dict]:
+        after_id = "0-0"
+        while True:
+            captions, next_id = self.read(after_id)
+            if next_id == after_id:
+                return
+            yield from captions
+            after_id = next_id
+
+
+async def stream_live_captions(job_id: str) -> AsyncIterator[str]:
+    """
+    Yield the captions of a job as Server-Sent Events: the ones already
+    finalized first, then new ones as the bot finalizes them, until the
+    recording is over.
+    """
+    key = caption_stream_key(job_id)
+    client = aioredis.Redis.from_url(REDIS_URL, decode_responses=True)
+    try:
+        last_id = "0-0"
+        while True:
+            response = await client.xread(
+                {key: last_id}, count=CAPTION_STREAM_BATCH, block=int(CAPTION_STREAM_KEEPALIVE_SECONDS * 1000)
+            )
+            if not response:
+                yield ": keep-alive\n\n"
+                continue
+            for entry_id, fields in response[0][1]:
+                last_id = entry_id
+                if END_MARKER in fields:
+                    yield "event: done\ndata: {}\n\n"
+                    return
+                yield f"event: caption\ndata: {json.dumps(_entry_to_caption(fields))}\n\n"
+    finally:
+        await client.aclose()
@@ -0,0 +1,119 @@
+import os
+import json
+import shutil
+import time
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Must be on storage shared by all workers (see the meetings-data volume)
+MEETING_CHECKPOINT_DIR = os.getenv("MEETING_CHECKPOINT_DIR", "/tmp/meetings/checkpoints")
+# Jobs can be reprocessed for this long after their last stage ran; 0 keeps checkpoints forever
+MEETING_CHECKPOINT_RETENTION_DAYS = float(os.getenv("MEETING_CHECKPOINT_RETENTION_DAYS", "7"))
+
+# Order in which stage outputs are merged back into the job context
+STAGE_ORDER = ["context", "record", "transcribe", "upload", "index", "summarize", "save"]
+
+# Stages whose checkpoints become stale when a stage is run again
+STAGE_DEPENDENTS = {
+    "record": ["transcribe", "upload", "index", "summarize", "save"],
+    "transcribe": ["index", "summarize", "save"],
+    "upload": ["save"],
+    "index": ["save"],
+    "summarize": ["save"],
+    "save": [],
+}
+
+
+class CheckpointStore:
+    """
+    Stores the output of every pipeline stage of one meeting job as JSON,
+    under a stable job id, so retries and reprocessing resume from the last
+    completed stage instead of re-joining, re-transcribing or re-summarizing.
+    """
+
+    def __init__(self, job_id: str, base_dir: str = MEETING_CHECKPOINT_DIR):
+        self.job_id = job_id
+        self.job_dir = os.path.join(base_dir, job_id)
+
+    def _path(self, stage: str) -> str:
+        return os.path.join(self.job_dir, f"{stage}.json")
+
+    def exists(self) -> bool:
+        return os.path.isdir(self.job_dir)
+
+    def save(self, stage: str, data: dict) -> None:
+        os.makedirs(self.job_dir, exist_ok=True)
+        path = self._path(stage)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, default=str)
+        # Atomic: a crash mid-write never leaves a truncated checkpoint behind
+        os.replace(tmp_path, path)
+
+    def load(self, stage: str) -> Optional[dict]:
+        try:
+            with open(self._path(stage), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except json.JSONDecodeError as e:
+            logger.warning(f"Ignoring corrupt checkpoint {stage} of job {self.job_id}: {e}")
+            return None
+
+    def completed_stages(self) -> list[str]:
+        return [stage for stage in STAGE_ORDER if os.path.exists(self._path(stage))]
+
+    def load_context(self) -> Optional[dict]:
+        """
+        Job context with the outputs of every completed stage merged in.
+        """
+        ctx = self.load("context")
+        if ctx is None:
+            return None
+        for stage in STAGE_ORDER[1:]:
+            ctx.update(self.load(stage) or {})
+        return ctx
+
+    def invalidate(self, stage: str) -> list[str]:
+        """
+        Drop the checkpoint of a stage and of every stage depending on it.
+        Returns the dropped stages.
+        """
+        dropped = []
+        for name in [stage] + STAGE_DEPENDENTS.get(stage, []):
+            try:
+                os.remove(self._path(name))
+                dropped.append(name)
+            except FileNotFoundError:
+                pass
+        return dropped
+
+    def clear(self) -> None:
+        shutil.rmtree(self.job_dir, ignore_errors=True)
+
+
+def sweep_checkpoints(
+    retention_days: float = MEETING_CHECKPOINT_RETENTION_DAYS, base_dir: str = MEETING_CHECKPOINT_DIR
+) -> list[str]:
+    """
+    Remove the checkpoints of jobs whose last stage ran more than retention_days ago.
+    Returns the removed job ids.
+    """
+    if retention_days <= 0 or not os.path.isdir(base_dir):
+        return []
+    cutoff = time.time() - retention_days * 86400
+    removed = []
+    for job_id in os.listdir(base_dir):
+        job_dir = os.path.join(base_dir, job_id)
+        try:
+            mtimes = [entry.stat().st_mtime for entry in os.scandir(job_dir)] or [os.path.getmtime(job_dir)]
+        except (NotADirectoryError, FileNotFoundError):
+            continue
+        if max(mtimes) < cutoff:
+            shutil.rmtree(job_dir, ignore_errors=True)
+            removed.append(job_id)
+    if removed:
+        logger.info(f" Removed checkpoints of {len(removed)} jobs older than {retention_days:g} days")
+    return removed
@@ -7,41 +7,127 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 from app import db
 from app.models.meeting import Meeting
 from app.schemas.meet import MeetRequest, MeetingMetadataDetails
 
 import threading
 import json
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable
 from datetime import datetime
 
 from app.schemas.transcript import TranscriptUtterance
+from app.services.meetings.browser_pool import get_browser_pool, browser_processes, BrowserResourceMonitor
+from app.services.meetings.audio_routing import open_bot_audio_sink, SHARED_SINK_NAME
+from app.services.meetings.rolling_transcription import (
+    SEGMENT_LIST,
+    SEGMENT_PATTERN,
+    TRANSCRIBE_SEGMENT_SECONDS,
+)
+from app.services.meetings.audio_format import recording_filename, codec_args, playback_args
+from app.services.meetings.join_state import (
+    JoinStateMachine,
+    LOBBY,
+    NAME_ENTERED,
+    WAITING_APPROVAL,
+    IN_CALL,
+    ENDED,
+    DENIED,
+    JOIN_PAGE_TIMEOUT,
+    JOIN_CLICK_TIMEOUT,
+    JOIN_CLICK_RETRY_SECONDS,
+    JOIN_APPROVAL_TIMEOUT,
+    JOIN_STATE_POLL_SECONDS,
+    LOBBY_SETUP_SCRIPT,
+    CLICK_JOIN_SCRIPT,
+    ENABLE_CAPTIONS_SCRIPT,
+)
 
 
 
 logger = logging.getLogger(__name__)
 
-def setup_chrome():
+# "full": visible, maximized Chrome rendering every participant's video
+# "lite": headless, small window, no images/animations and remote video dropped;
+#         only the captions DOM and WebRTC audio matter to the bot
+BOT_BROWSER_MODE = os.getenv("BOT_BROWSER_MODE", "full").lower()
+LITE_WINDOW_SIZE = os.getenv("LITE_WINDOW_SIZE", "1024,768")
+
+# Injected before Meet's own scripts in lite mode
+LITE_PAGE_SCRIPT = """
+(() => {
+    // Remote video is never looked at: every negotiation marks the video transceivers
+    // as not receiving, so the SFU stops sending video and Chrome has nothing to decode
+    const NativePeerConnection = window.RTCPeerConnection;
+    const stopReceivingVideo = (pc) => {
+        for (const transceiver of pc.getTransceivers()) {
+            if (transceiver.receiver.track.kind !== 'video' || transceiver.currentDirection === 'stopped') continue;
+            const sending = transceiver.direction === 'sendrecv' || transceiver.direction === 'sendonly';
+            const direction = sending ? 'sendonly' : 'inactive';
+            try {
+                if (transceiver.direction !== direction) transceiver.direction = direction;
+            } catch (e) {}
+        }
+    };
+    window.RTCPeerConnection = class extends NativePeerConnection {
+        constructor(...args) {
+            super(...args);
+            // Until the next negotiation applies the direction, at least don't paint it
+            this.addEventListener('track', (event) => {
+                if (event.track.kind === 'video') event.track.enabled = false;
+            });
+        }
+        createOffer(...args) {
+            stopReceivingVideo(this);
+            return super.createOffer(...args);
+        }
+        createAnswer(...args) {
+            stopReceivingVideo(this);
+            return super.createAnswer(...args);
+        }
+    };
+    const addStyle = () => {
+        const style = document.createElement('style');
+        style.textContent = 'video { display: none !important; } '
+            + '*, *::before, *::after { animation: none !important; transition: none !important; }';
+        document.documentElement.appendChild(style);
+    };
+    if (document.documentElement) addStyle();
+    else document.addEventListener('DOMContentLoaded', addStyle);
+})();
+"""
+
+
+def setup_chrome(profile_dir: str = None, mode: str = None):
     """
     Setup Chrome with media permissions.
+    Each concurrently running browser needs its own profile_dir.
     """
-    profile_dir = os.path.join(os.getcwd(), "chrome_profile")
+    profile_dir = profile_dir or os.path.join(os.getcwd(), "chrome_profile")
     os.makedirs(profile_dir, exist_ok=True)
+    lite = (mode or BOT_BROWSER_MODE) == "lite"
     
     chrome_options = Options()
     chrome_options.add_argument(f'--user-data-dir={profile_dir}')
     chrome_options.add_argument('--profile-directory=Default')
     chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-    chrome_options.add_argument('--start-maximized')
     chrome_options.add_experimental_option("prefs", {
         "profile.default_content_setting_values.media_stream_mic": 1,
         "profile.default_content_setting_values.media_stream_camera": 1,
         "profile.default_content_setting_values.notifications": 1
     })
     chrome_options.add_argument('--autoplay-policy=no-user-gesture-required')
-    # chrome_options.add_argument('--headless=new')  # Uncomment for headless mode
+
+    if lite:
+        chrome_options.add_argument('--headless=new')
+        chrome_options.add_argument(f'--window-size={LITE_WINDOW_SIZE}')
+        chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+        chrome_options.add_argument('--force-prefers-reduced-motion')
+        chrome_options.add_argument('--disable-software-rasterizer')
+        chrome_options.add_argument('--disable-background-networking')
+    else:
+        chrome_options.add_argument('--start-maximized')
     
     # Stability options
     chrome_options.add_argument('--no-sandbox')
@@ -50,20 +136,52 @@ def setup_chrome():
     chrome_options.add_argument('--disable-extensions')
 
     service = Service("/usr/bin/chromedriver")
-    return webdriver.Chrome(service=service, options=chrome_options)
+    driver = webdriver.Chrome(service=service, options=chrome_options)
+
+    if lite:
+        # Meet turns away "HeadlessChrome" user agents
+        user_agent = driver.execute_script("return navigator.userAgent").replace("HeadlessChrome", "Chrome")
+        driver.execute_cdp_cmd("Network.setUserAgentOverride", {"userAgent": user_agent})
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": LITE_PAGE_SCRIPT})
+    return driver
 
 
-def start_ffmpeg(output_file="meeting_audio.wav"):
-    """Record audio from PulseAudio virtual sink"""
-    return subprocess.Popen([
+def start_ffmpeg(output_file=None, source="meet_sink.monitor", segment_dir=None,
+                 segment_seconds=TRANSCRIBE_SEGMENT_SECONDS, audio_format=None, playback_dir=None):
+    """
+    Record audio from a PulseAudio sink monitor, encoded as audio_format
+    (RECORDING_FORMAT by default: opus, flac or wav).
+    With segment_dir, fixed-length segments are written there as well, and each
+    closed one is listed in segment_dir/segments.csv (name, start, end).
+    With playback_dir, an HLS manifest and its segments are written there for seekable playback.
+    """
+    output_file = output_file or recording_filename(audio_format)
+    command = [
         "ffmpeg",
         "-y",                       # overwrite
         "-f", "pulse",
-        "-i", "meet_sink.monitor",  # PulseAudio monitor
+        "-i", source,               # PulseAudio monitor
         "-ac", "1",
         "-ar", "16000",
+        *codec_args(audio_format),
         output_file
-    ])
+    ]
+    if segment_dir:
+        command += [
+            "-ac", "1",
+            "-ar", "16000",
+            *codec_args(audio_format),
+            "-f", "segment",
+            "-segment_time", str(segment_seconds),
+            "-segment_list", os.path.join(segment_dir, SEGMENT_LIST),
+            "-segment_list_type", "csv",
+            "-reset_timestamps", "1",
+            os.path.join(segment_dir, SEGMENT_PATTERN),
+        ]
+    if playback_dir:
+        os.makedirs(playback_dir, exist_ok=True)
+        command += playback_args(playback_dir)
+    return subprocess.Popen(command)
 
 
 def move_chrome_to_sink(sink_name="meet_sink", retries=15, delay=2):
@@ -116,7 +234,191 @@ def format_timestamp(seconds: float) -> str:
     else:
         return f"{mins:02d}:{secs:02d}"
 
-def scrape_captions_json(driver, stop_event=None, interval=1.5, stable_time=1.5, start_time=None, shared_list=None):
+# "observer": a MutationObserver buffers caption changes in the page, drained every tick
+# "snapshot": all caption blocks in one execute_script per tick
+# "dom": find_element/.text per block (one WebDriver round trip each)
+CAPTION_SCRAPE_MODE = os.getenv("CAPTION_SCRAPE_MODE", "snapshot").lower()
+CAPTION_POLL_INTERVAL = float(os.getenv("CAPTION_POLL_INTERVAL", "1.5"))
+# Oldest buffered caption changes are dropped beyond this (Python stopped draining)
+CAPTION_EVENT_BUFFER = int(os.getenv("CAPTION_EVENT_BUFFER", "2000"))
+# Characters of already emitted text remembered per speaker to find where new text starts
+CAPTION_TAIL_CHARS = int(os.getenv("CAPTION_TAIL_CHARS", "200"))
+# Finalizer state of a speaker without captions on screen for this long is dropped
+CAPTION_STATE_TTL_SECONDS = float(os.getenv("CAPTION_STATE_TTL_SECONDS", "300"))
+
+CAPTION_BLOCKS_JS = """
+const findCaptionRegion = () => document.querySelector("div[role='region'][aria-label='Captions']");
+const readCaptionBlocks = (region) => [...region.querySelectorAll("div[class*='nMcdL']")].map((block) => {
+    const speaker = block.querySelector('.NWpY1d');
+    const text = block.querySelector('.VbkSUe');
+    return [speaker ? speaker.innerText.trim() : '', text ? text.innerText.trim() : ''];
+});
+"""
+
+# [[speaker, text], ...] of every caption block, or null while the captions region isn't shown
+CAPTION_SNAPSHOT_SCRIPT = CAPTION_BLOCKS_JS + """
+const region = findCaptionRegion();
+return region ? readCaptionBlocks(region) : null;
+"""
+
+# Returns and clears the buffered [timestamp, blocks] changes, (re)attaching the
+# observer whenever Meet renders a new captions region
+CAPTION_DRAIN_SCRIPT = CAPTION_BLOCKS_JS + """
+const [maxEvents] = arguments;
+const region = findCaptionRegion();
+let capture = window.__botCaptions;
+if (region && (!capture || capture.region !== region)) {
+    if (capture) capture.observer.disconnect();
+    capture = window.__botCaptions = { region, events: capture ? capture.events : [], last: '' };
+    const record = () => {
+        const blocks = readCaptionBlocks(region);
+        const key = JSON.stringify(blocks);
+        if (key === capture.last) return;
+        capture.last = key;
+        capture.events.push([Date.now() / 1000, blocks]);
+        if (capture.events.length > maxEvents) capture.events.shift();
+    };
+    capture.observer = new MutationObserver(record);
+    capture.observer.observe(region, { childList: true, subtree: true, characterData: true });
+    record();
+}
+return capture ? capture.events.splice(0) : [];
+"""
+
+
+def read_caption_blocks(driver, mode: str = None) -> List[tuple]:
+    """
+    (speaker, text) of every caption block currently shown.
+    Raises if the captions region isn't there (yet).
+    mode defaults to CAPTION_SCRAPE_MODE.
+    """
+    mode = mode or CAPTION_SCRAPE_MODE
+    if mode == "snapshot":
+        blocks = driver.execute_script(CAPTION_SNAPSHOT_SCRIPT)
+        if blocks is None:
+            raise LookupError("Captions region not found")
+        return [(speaker, text) for speaker, text in blocks]
+
+    container = driver.find_element(By.XPATH, "//div[@role='region' and @aria-label='Captions']")
+    blocks = []
+    for block in container.find_elements(By.XPATH, ".//div[contains(@class,'nMcdL')]"):
+        try:
+            speaker = block.find_element(By.CSS_SELECTOR, ".NWpY1d").text.strip()
+        except:
+            speaker = ""
+        try:
+            text = block.find_element(By.CSS_SELECTOR, ".VbkSUe").text.strip()
+        except:
+            text = ""
+        blocks.append((speaker, text))
+    return blocks
+
+
+def drain_caption_events(driver) -> List[tuple]:
+    """
+    (timestamp, [(speaker, text), ...]) for every caption change since the last drain.
+    """
+    events = driver.execute_script(CAPTION_DRAIN_SCRIPT, CAPTION_EVENT_BUFFER)
+    return [(timestamp, [tuple(block) for block in blocks]) for timestamp, blocks in events]
+
+
+class CaptionFinalizer:
+    """
+    Turns caption snapshots into finalized captions, one speaker turn at a time.
+
+    Per speaker only the current caption text and a short tail of what was
+    already emitted are kept: a finalized block emits just the suffix after
+    that tail (an O(tail) check instead of comparing whole texts), and state of
+    speakers that left the captions panel is dropped after state_ttl seconds.
+    Memory and CPU per tick follow the panel size, not the meeting length.
+    """
+
+    def __init__(
+        self,
+        sink: List[Dict[str, Any]],
+        start_time: float,
+        stable_time: float = 1.5,
+        tail_chars: int = CAPTION_TAIL_CHARS,
+        state_ttl: float = CAPTION_STATE_TTL_SECONDS,
+    ):
+        self.sink = sink
+        self.start_time = start_time
+        self.stable_time = stable_time
+        self.tail_chars = tail_chars
+        self.state_ttl = state_ttl
+        self.speakers = {}
+
+    @staticmethod
+    def merge_blocks(blocks) -> List[tuple]:
+        """
+        Merge consecutive blocks of the same speaker, skipping empty ones.
+        """
+        merged = []
+        for speaker, text in blocks:
+            if not speaker or not text:
+                continue
+            if merged and merged[-1][0] == speaker:
+                merged[-1][1].append(text)
+            else:
+                merged.append((speaker, [text]))
+        return [(speaker, " ".join(texts).strip()) for speaker, texts in merged]
+
+    def new_suffix(self, state: dict, text: str) -> str:
+        """
+        Part of text that wasn't emitted yet for this speaker.
+        """
+        tail, emitted_len = state["emitted_tail"], state["emitted_len"]
+        if not tail:
+            return text
+        # Text grew in place: the emitted tail is still where we left it
+        if text[emitted_len - len(tail):emitted_len] == tail:
+            return text[emitted_len:].lstrip(". ").strip()
+        # Meet trimmed or rewrote the front of the block: find the tail again
+        idx = text.rfind(tail)
+        if idx >= 0:
+            return text[idx + len(tail):].lstrip(". ").strip()
+        return text
+
+    def update(self, blocks, current_time: float) -> None:
+        for speaker, text in self.merge_blocks(blocks):
+            state = self.speakers.get(speaker)
+            if state is None:
+                self.speakers[speaker] = {
+                    "text": text,
+                    "last_seen": current_time,     # last text change
+                    "last_present": current_time,  # last tick the speaker was on screen
+                    "finalized": False,
+                    "emitted_tail": "",
+                    "emitted_len": 0,
+                }
+                continue
+            state["last_present"] = current_time
+            # Text changed → reset timer
+            if state["text"] != text:
+                state.update(text=text, last_seen=current_time, finalized=False)
+                continue
+            # Text stable → finalize if enough time passed
+            if not state["finalized"] and current_time - state["last_seen"] > self.stable_time:
+                new_text = self.new_suffix(state, text)
+                if new_text:  # Only finalize non-empty new text
+                    self.sink.append({
+                        "speaker": speaker,
+                        "text": new_text,
+                        "timestamp": format_timestamp(current_time - self.start_time),
+                    })
+                state["emitted_tail"] = text[-self.tail_chars:]
+                state["emitted_len"] = len(text)
+                state["finalized"] = True
+
+        # Forget speakers that haven't had captions on screen for a while
+        for speaker in [
+            name for name, state in self.speakers.items()
+            if current_time - state["last_present"] > self.state_ttl and state["finalized"]
+        ]:
+            del self.speakers[speaker]
+
+
+def scrape_captions_json(driver, stop_event=None, interval=CAPTION_POLL_INTERVAL, stable_time=1.5, start_time=None, shared_list=None, mode=None):
     """
     Robust Google Meet captions scraper.
 
@@ -127,99 +429,26 @@ def scrape_captions_json(driver, stop_event=None, interval=1.5, stable_time=1.5,
     - Saves only new appended text.
     - Ignores captions with empty speaker.
     - Merges consecutive blocks from the same speaker.
+
+    In "observer" mode every buffered change is replayed with the time it happened
+    in the page, so stabilization runs on real change timestamps.
     """
+    mode = mode or CAPTION_SCRAPE_MODE
     finalized_captions = [] if shared_list is None else shared_list
-    active_captions = {}         # Current text per speaker
-    last_finalized_text = {}     # Last finalized text per speaker
     if start_time is None:
         start_time = time.time()  # fallback   # Relative timestamp base
+    finalizer = CaptionFinalizer(finalized_captions, start_time, stable_time)
 
+    last_blocks = []
     while not (stop_event and stop_event.is_set()):
         try:
-            container = driver.find_element(By.XPATH, "//div[@role='region' and @aria-label='Captions']")
-            blocks = container.find_elements(By.XPATH, ".//div[contains(@class,'nMcdL')]")
-            current_time = time.time()
-            updated = False
-
-            # Process blocks to merge consecutive same-speaker blocks
-            merged_blocks = []
-            current_speaker = None
-            current_text = ""
-
-            for block in blocks:
-                try:
-                    speaker = block.find_element(By.CSS_SELECTOR, ".NWpY1d").text.strip()
-                except:
-                    speaker = ""
-
-                # Skip empty speaker blocks
-                if not speaker:
-                    continue
-
-                try:
-                    text = block.find_element(By.CSS_SELECTOR, ".VbkSUe").text.strip()
-                except:
-                    text = ""
-                if not text:
-                    continue
-
-                # Merge consecutive blocks from same speaker
-                if speaker == current_speaker:
-                    # Same speaker - merge text
-                    current_text += " " + text
-                else:
-                    # Different speaker - save previous merged block if exists
-                    if current_speaker:
-                        merged_blocks.append({
-                            "speaker": current_speaker,
-                            "text": current_text.strip()
-                        })
-
-                    # Start new merged block
-                    current_speaker = speaker
-                    current_text = text
-
-            # Don't forget the last merged block
-            if current_speaker:
-                merged_blocks.append({
-                    "speaker": current_speaker,
-                    "text": current_text.strip()
-                })
-
-            # Process merged blocks
-            for merged_block in merged_blocks:
-                speaker = merged_block["speaker"]
-                text = merged_block["text"]
-
-                # Initialize if new speaker
-                if speaker not in active_captions:
-                    active_captions[speaker] = {"text": text, "last_seen": current_time, "finalized": False}
-                else:
-                    # Text changed → reset timer
-                    if active_captions[speaker]["text"] != text:
-                        active_captions[speaker]["text"] = text
-                        active_captions[speaker]["last_seen"] = current_time
-                        active_captions[speaker]["finalized"] = False
-                    else:
-                        # Text stable → finalize if enough time passed
-                        if not active_captions[speaker]["finalized"] and current_time - active_captions[speaker]["last_seen"] > stable_time:
-                            prev_text = last_finalized_text.get(speaker, "")
-                            new_text = text
-
-                            # Remove repeated prefix
-                            if prev_text and new_text.startswith(prev_text):
-                                new_text = new_text[len(prev_text):].lstrip(". ").strip()
-
-                            if new_text:  # Only finalize non-empty new text
-                                elapsed = current_time - start_time
-                                finalized_captions.append({
-                                    "speaker": speaker,
-                                    "text": new_text,
-                                    "timestamp": format_timestamp(elapsed)
-                                })
-                                last_finalized_text[speaker] = text
-
-                            active_captions[speaker]["finalized"] = True
+            if mode == "observer":
+                for event_time, last_blocks in drain_caption_events(driver):
+                    finalizer.update(last_blocks, event_time)
+                # Nothing changed since the last event: check whether the text is stable by now
+                finalizer.update(last_blocks, time.time())
+            else:
+                finalizer.update(read_caption_blocks(driver, mode), time.time())
 
         except Exception:
             pass
@@ -229,163 +458,177 @@ def scrape_captions_json(driver, stop_event=None, interval=1.5, stable_time=1.5,
     return finalized_captions
 
 
+def join_call(driver, request: MeetRequest, join: JoinStateMachine) -> bool:
+    """
+    Open the meeting page and get the bot into the call: mic/cam off, guest
+    name, join button, host approval. Returns True once in the call.
+    """
+    driver.get(request.meet_url)
+    join.install()
+
+    # Step 1 — Pre-join screen (a signed-in bot may land straight in the call)
+    state = join.wait_until({LOBBY, WAITING_APPROVAL, IN_CALL}, JOIN_PAGE_TIMEOUT)
+    if state == LOBBY:
+        lobby = driver.execute_script(LOBBY_SETUP_SCRIPT)
+        for device in lobby["switchedOff"]:
+            logger.info(f" {device.capitalize()} disabled")
+        if lobby["nameInput"]:
+            guest_name = getattr(request, 'guest_name', 'Meeting Bot')
+            lobby["nameInput"].clear()
+            lobby["nameInput"].send_keys(guest_name)
+            logger.info(f" Entered name: {guest_name}")
+        join.transition(NAME_ENTERED)
+
+        # Step 2 — Ask to join / Join now: the button can render late or stay
+        # disabled for a moment, so click again until the bot leaves the lobby
+        deadline = time.monotonic() + JOIN_CLICK_TIMEOUT
+        while state not in (WAITING_APPROVAL, IN_CALL, ENDED, DENIED):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                clicked = WebDriverWait(driver, remaining, poll_frequency=0.25).until(
+                    lambda d: d.execute_script(CLICK_JOIN_SCRIPT)
+                )
+            except TimeoutException:
+                logger.warning(" Could not find an enabled join button")
+                break
+            logger.info(f" Clicked {clicked}")
+            state = join.wait_until(
+                {WAITING_APPROVAL, IN_CALL}, max(0.0, min(JOIN_CLICK_RETRY_SECONDS, deadline - time.monotonic()))
+            )
+
+    # Step 3 — Lobby of the host
+    if state == WAITING_APPROVAL:
+        logger.info(" Waiting for host approval")
+        state = join.wait_until({IN_CALL}, JOIN_APPROVAL_TIMEOUT)
+
+    if state != IN_CALL:
+        logger.error(f" Failed to join meeting (state: {state})")
+        return False
+    logger.info(" Successfully joined the meeting")
+
+    # Step 4 — Turn on captions
+    try:
+        captions = WebDriverWait(driver, 15, poll_frequency=0.25).until(
+            lambda d: d.execute_script(ENABLE_CAPTIONS_SCRIPT)
+        )
+        logger.info(" Captions turned ON" if captions == "on" else " Captions already ON")
+    except Exception:
+        logger.warning(" Could not enable captions")
+    return True
+
+
 def join_and_record_meeting(
     request: MeetRequest,
     record_seconds: int = 60,
-    output_file: str = "meeting_audio.wav",
+    output_file: str = None,
+    shared_captions: List[Dict[str, Any]] = None,
+    resource_stats: Dict[str, Any] = None,
+    join_timings: Dict[str, float] = None,
+    segment_dir: str = None,
+    playback_dir: str = None,
 ):
     """
     Join Google Meet as guest, disable mic/cam, record audio and captions.
+    Finalized captions are appended to shared_captions (a list or a CaptionStream,
+    if given) while recording, so callers can consume them before the meeting ends.
+    CPU/RSS of the bot's browser during the recording is written to resource_stats (if given),
+    seconds spent per join state (lobby, waiting_approval, in_call, ...) to join_timings.
+    With segment_dir, the audio is also cut into segments there for rolling transcription,
+    with playback_dir an HLS rendition for seekable playback is written there.
     """
     record_seconds = int(record_seconds)
+    output_file = output_file or recording_filename()
     logger.info(f"Launching Chrome to join meeting: {request.meet_url}")
 
-    driver = setup_chrome()
+    browser_pool = get_browser_pool()
+    browser_slot = None
+    driver = None
+    audio_sink = None
+    join = None
     ffmpeg_proc = None
+    resource_monitor = None
     caption_thread = None
     stop_scraping = threading.Event()
-    shared_captions = []
+    shared_captions = [] if shared_captions is None else shared_captions
     joined = False  # <-- track join status
 
     try:
-        driver.get(request.meet_url)
-        time.sleep(5)
-
-        # Disable mic
-        try:
-            mic_button = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, "//div[@role='button'][@aria-label[contains(., 'microphone')]]"))
-            )
-            if mic_button.get_attribute("aria_pressed") != "true":
-                mic_button.click()
-                logger.info(" Mic disabled")
-        except Exception:
-            logger.warning(" Could not find mic button")
-
-        # Disable cam
-        try:
-            cam_button = driver.find_element(By.XPATH, "//div[@role='button'][@aria-label[contains(., 'camera')]]")
-            if cam_button.get_attribute("aria_pressed") != "true":
-                cam_button.click()
-                logger.info(" Camera disabled")
-        except Exception:
-            logger.warning(" Could not find camera button")
-
-        # Enter name
-        try:
-            name_input = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, "//input[@aria-label='Your name']"))
-            )
-            guest_name = getattr(request, 'guest_name', 'Meeting Bot')
-            name_input.clear()
-            name_input.send_keys(guest_name)
-            logger.info(f" Entered name: {guest_name}")
-        except Exception as e:
-            logger.warning(f" Could not enter name: {e}")
-
-        # Click Ask to Join / Join now
-        try:
-            ask_to_join_button = WebDriverWait(driver, 15).until(
-                EC.element_to_be_clickable((By.XPATH, "//span[text()='Ask to join']/ancestor::button"))
-            )
-            ask_to_join_button.click()
-            logger.info(" Clicked Ask to join")
-        except Exception:
-            try:
-                join_button = WebDriverWait(driver, 5).until(
-                    EC.element_to_be_clickable((By.XPATH, "//span[text()='Join now']/ancestor::button"))
-                )
-                join_button.click()
-                logger.info(" Clicked Join now (fallback)")
-            except Exception:
-                logger.warning(" Could not find join button")
-
-        # Wait until inside meeting
-        try:
-            WebDriverWait(driver, 30).until(
-                lambda driver: (
-                    driver.find_elements(By.XPATH, "//button[@aria-label='Leave call']") or
-                    driver.find_elements(By.XPATH, "//*[contains(text(), 'Waiting for') or contains(text(), 'asking to join')]")
-                )
-            )
-            if driver.find_elements(By.XPATH, "//button[@aria-label='Leave call']"):
-                logger.info(" Successfully joined the meeting")              
-                joined = True
-            else:
-                logger.info(" Waiting for host approval")
-                try:
-                    WebDriverWait(driver, 600).until(
-                        EC.presence_of_element_located((By.XPATH, "//button[@aria-label='Leave call']"))
-                    )
-                    logger.info(" Host approved - now in meeting")
-                    joined = True
-                except Exception:
-                    logger.error(" Host did not approve join request — exiting")
-                    return None, []
-        except Exception as e:
-            logger.error(f" Failed to join meeting: {e}")
+        # Warm browser from the pool when enabled, otherwise a fresh Chrome
+        browser_slot = browser_pool.acquire() if browser_pool else None
+        driver = browser_slot.driver if browser_slot else setup_chrome()
+        # Own sink per session: Chrome's streams are moved into it as soon as they appear
+        audio_sink = open_bot_audio_sink(lambda: {proc.pid for proc in browser_processes(driver)})
+        join = JoinStateMachine(driver)
+
+        joined = join_call(driver, request, join)
+        if not joined:
             return None, []
 
-        #  Only start recording if joined
-        if joined:
-            # Turn on captions
+        # Without a per-bot sink, move Chrome audio to the shared virtual sink
+        if not audio_sink:
+            move_chrome_to_sink(SHARED_SINK_NAME)
+
+        start_time = time.time()
+        # Start captions scraping thread
+        caption_thread = threading.Thread(
+            target=scrape_captions_json,
+            args=(driver, stop_scraping, CAPTION_POLL_INTERVAL, 1.5, start_time, shared_captions),
+            daemon=True
+        )
+        caption_thread.start()
+        logger.info(" Started captions scraping")
+
+        resource_monitor = BrowserResourceMonitor(driver).start()
+
+        # Start FFmpeg
+        ffmpeg_proc = start_ffmpeg(
+            output_file,
+            audio_sink.monitor if audio_sink else f"{SHARED_SINK_NAME}.monitor",
+            segment_dir=segment_dir,
+            playback_dir=playback_dir,
+        )
+        logger.info(f" Recording meeting audio for {record_seconds} seconds...")
+
+        # Recording loop: the page watcher tracks the call, we only read its state
+        start_time = time.time()
+        while True:
+            remaining = record_seconds - (time.time() - start_time)
+            if remaining <= 0:
+                logger.info(" Max recording time reached — stopping")
+                break
             try:
-                captions_button = WebDriverWait(driver, 15).until(
-                    EC.presence_of_element_located((By.XPATH, "//button[contains(@aria-label, 'captions')]"))
-                )
-                if "Turn on captions" in captions_button.get_attribute("aria-label"):
-                    captions_button.click()
-                    logger.info(" Captions turned ON")
-                else:
-                    logger.info(" Captions already ON")
+                join.poll()
             except Exception:
-                logger.warning(" Could not enable captions")
-
-            # Move Chrome audio to virtual sink
-            move_chrome_to_sink("meet_sink")
-
-            start_time = time.time()
-            # Start captions scraping thread
-            caption_thread = threading.Thread(
-                target=scrape_captions_json,
-                args=(driver, stop_scraping, 1.5, 1.5, start_time, shared_captions),
-                daemon=True
-            )
-            caption_thread.start()
-            logger.info(" Started captions scraping")
-
-            # Start FFmpeg
-            ffmpeg_proc = start_ffmpeg(output_file)
-            logger.info(f" Recording meeting audio for {record_seconds} seconds...")
-
-            # Recording loop
-            start_time = time.time()
-            while True:
-                elapsed = time.time() - start_time
-
-                # Meeting ended?
-                try:
-                    leave_button = driver.find_element(By.XPATH, "//button[@aria-label='Leave call']")
-                    if not leave_button.is_displayed():
-                        logger.info(" Leave call button disappeared — meeting ended")
-                        break
-                except:
-                    logger.info(" Leave call button not found — meeting likely ended")
-                    break
-
-                # Timeout
-                if elapsed > record_seconds:
-                    logger.info(" Max recording time reached — stopping")
-                    break
-
-                time.sleep(2)
+                join.transition(ENDED)
+            if join.state != IN_CALL:
+                logger.info(" Leave call button disappeared — meeting ended")
+                break
+            time.sleep(min(JOIN_STATE_POLL_SECONDS, remaining))
 
     finally:
+        if join:
+            if joined and join.state == IN_CALL:
+                join.transition(ENDED)
+            timings = join.finish()
+            logger.info(f" Join state timings (s): {timings}")
+            if join_timings is not None:
+                join_timings.update(timings)
         stop_scraping.set()
         if caption_thread:
             caption_thread.join(timeout=5)
-        driver.quit()
-        logger.info(" Browser closed")
+        if resource_monitor:
+            stats = {"mode": BOT_BROWSER_MODE, **resource_monitor.stop()}
+            logger.info(f" Bot browser resources: {stats}")
+            if resource_stats is not None:
+                resource_stats.update(stats)
+        if browser_slot:
+            browser_pool.release(browser_slot)
+            logger.info(" Browser returned to pool")
+        elif driver:
+            driver.quit()
+            logger.info(" Browser closed")
 
         if ffmpeg_proc:
             try:
@@ -394,6 +637,8 @@ def join_and_record_meeting(
                 logger.info(f" Meeting audio saved to: {output_file}")
             except Exception as e:
                 logger.warning(f" Failed to stop FFmpeg: {e}")
+        if audio_sink:
+            audio_sink.close()
 
         return output_file if joined else None, shared_captions if joined else []
 def parse_timestamp_to_seconds(timestamp: str) -> float:
@@ -452,7 +697,7 @@ def seconds_to_timestamp(seconds: float) -> str:
 
 def merge_transcript_with_captions(
     transcript: List[TranscriptUtterance], 
-    captions: List[Dict[str, Any]]
+    captions: Iterable[Dict[str, Any]]
 ) -> Dict[str, Any]:
     merged = []
     for idx, (t, c) in enumerate(zip(transcript, captions), start=1):
@@ -535,7 +780,7 @@ def generate_summary_stats(merged_data: Dict[str, Any]) -> Dict[str, Any]:
         return {}
 
 # Example usage function
-def process_meeting_transcript( transcript: List[Dict[str, Any]], captions: List[Dict[str, Any]]) -> Dict[str, Any]:
+def process_meeting_transcript( transcript: List[Dict[str, Any]], captions: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
     """
     Complete workflow to process meeting transcript:
     1. Transcript already passed into function
@@ -0,0 +1,188 @@
+import os
+import time
+import logging
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# How long to wait for the Meet pre-join screen, for the join click to be
+# acknowledged and for the host to admit the bot
+JOIN_PAGE_TIMEOUT = float(os.getenv("JOIN_PAGE_TIMEOUT", "30"))
+JOIN_CLICK_TIMEOUT = float(os.getenv("JOIN_CLICK_TIMEOUT", "30"))
+JOIN_APPROVAL_TIMEOUT = float(os.getenv("JOIN_APPROVAL_TIMEOUT", "600"))
+# Seconds to wait for a join click to register before clicking again
+JOIN_CLICK_RETRY_SECONDS = float(os.getenv("JOIN_CLICK_RETRY_SECONDS", "5"))
+# Seconds between in-call state reads while recording (one cheap RPC each)
+JOIN_STATE_POLL_SECONDS = float(os.getenv("JOIN_STATE_POLL_SECONDS", "5"))
+
+LOADING = "loading"
+LOBBY = "lobby"
+NAME_ENTERED = "name_entered"
+WAITING_APPROVAL = "waiting_approval"
+IN_CALL = "in_call"
+ENDED = "ended"
+DENIED = "denied"
+
+# Page watcher: a MutationObserver classifies the Meet page and notifies
+# listeners on every change, so Python blocks on one async script instead of
+# chaining WebDriverWaits.
+WATCHER_SCRIPT = """
+if (window.__botJoin) return window.__botJoin.state;
+const watcher = { state: 'loading', listeners: new Set(), scheduled: false };
+const detect = () => {
+    if (document.querySelector("button[aria-label='Leave call']")) return 'in_call';
+    if (watcher.state === 'in_call' || watcher.state === 'ended') return 'ended';
+    const text = document.body ? document.body.innerText : '';
+    if (/You can't join this call|denied your request|removed from the meeting/i.test(text)) return 'denied';
+    if (/Waiting for|asking to join/i.test(text)) return 'waiting_approval';
+    if (document.querySelector("input[aria-label='Your name']")
+        || /Ask to join|Join now/.test(text)) return 'lobby';
+    return 'loading';
+};
+const update = () => {
+    watcher.scheduled = false;
+    const state = detect();
+    if (state === watcher.state) return;
+    watcher.state = state;
+    watcher.listeners.forEach((listener) => listener(state));
+};
+// Meet mutates the DOM constantly; classify at most every 100ms
+new MutationObserver(() => {
+    if (!watcher.scheduled) {
+        watcher.scheduled = true;
+        setTimeout(update, 100);
+    }
+}).observe(document, { childList: true, subtree: true, attributes: true, characterData: true });
+window.__botJoin = watcher;
+update();
+return watcher.state;
+"""
+
+# Resolves as soon as the page state differs from arguments[0], or after arguments[1] ms
+WAIT_FOR_CHANGE_SCRIPT = """
+const [known, timeoutMs, done] = arguments;
+const watcher = window.__botJoin;
+if (!watcher) return done(null);
+if (watcher.state !== known) return done(watcher.state);
+const listener = (state) => { clearTimeout(timer); watcher.listeners.delete(listener); done(state); };
+const timer = setTimeout(() => { watcher.listeners.delete(listener); done(watcher.state); }, timeoutMs);
+watcher.listeners.add(listener);
+"""
+
+READ_STATE_SCRIPT = "return window.__botJoin ? window.__botJoin.state : null;"
+
+# Pre-join screen: switch off mic and camera, return the name input (if the bot is a guest)
+LOBBY_SETUP_SCRIPT = """
+const switchedOff = [];
+for (const device of ['microphone', 'camera']) {
+    const button = document.querySelector(`div[role='button'][aria-label*='${device}']`);
+    if (button && /turn off/i.test(button.getAttribute('aria-label'))) {
+        button.click();
+        switchedOff.push(device);
+    }
+}
+return { switchedOff, nameInput: document.querySelector("input[aria-label='Your name']") };
+"""
+
+# Returns the label of the clicked join button, or null when there is none yet
+# Label of the clicked button, null while no join button is rendered and enabled
+CLICK_JOIN_SCRIPT = """
+for (const label of ['Ask to join', 'Join now']) {
+    const span = [...document.querySelectorAll('button span')].find((s) => s.textContent.trim() === label);
+    const button = span && span.closest('button');
+    if (button && !button.disabled && button.getAttribute('aria-disabled') !== 'true') {
+        button.click();
+        return label;
+    }
+}
+return null;
+"""
+
+# "on" when captions were switched on, "already" when they were on, null when the button isn't rendered yet
+ENABLE_CAPTIONS_SCRIPT = """
+const button = document.querySelector("button[aria-label*='captions']");
+if (!button) return null;
+if (button.getAttribute('aria-label').includes('Turn on captions')) {
+    button.click();
+    return 'on';
+}
+return 'already';
+"""
+
+
+class JoinStateMachine:
+    """
+    Tracks a bot through lobby -> name_entered -> waiting_approval -> in_call -> ended,
+    driven by the page watcher above, and records the time spent in each state.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.state = LOADING
+        self.page_state = LOADING
+        self.timings: Dict[str, float] = {}
+        self._entered_at = time.monotonic()
+
+    def install(self) -> str:
+        self.page_state = self.driver.execute_script(WATCHER_SCRIPT)
+        self._follow_page(self.page_state)
+        return self.state
+
+    def transition(self, state: str) -> None:
+        if state == self.state:
+            return
+        now = time.monotonic()
+        spent = now - self._entered_at
+        self.timings[self.state] = round(self.timings.get(self.state, 0.0) + spent, 2)
+        logger.info(f" Join state {self.state} -> {state} after {spent:.1f}s")
+        self.state = state
+        self._entered_at = now
+
+    def _follow_page(self, page_state: Optional[str]) -> None:
+        if page_state is None:
+            # Page navigated away and took the watcher with it
+            if self.state == IN_CALL:
+                self.transition(ENDED)
+                return
+            self.page_state = self.driver.execute_script(WATCHER_SCRIPT)
+            page_state = self.page_state
+        # The page still shows the lobby after the name is typed in
+        if page_state == LOBBY and self.state == NAME_ENTERED:
+            return
+        if page_state != LOADING:
+            self.transition(page_state)
+
+    def wait_until(self, targets: set, timeout: float) -> str:
+        """
+        Block until the machine reaches one of the target states (or any terminal
+        one) or the timeout expires; returns the current state.
+        """
+        deadline = time.monotonic() + timeout
+        while self.state not in targets and self.state not in (ENDED, DENIED):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self.driver.set_script_timeout(remaining + 5)
+            self.page_state = self.driver.execute_async_script(
+                WAIT_FOR_CHANGE_SCRIPT, self.page_state, int(remaining * 1000)
+            )
+            self._follow_page(self.page_state)
+        return self.state
+
+    def poll(self) -> str:
+        """
+        One RPC reading the watcher's current state (used while recording).
+        """
+        self.page_state = self.driver.execute_script(READ_STATE_SCRIPT)
+        self._follow_page(self.page_state)
+        return self.state
+
+    def finish(self) -> Dict[str, float]:
+        """
+        Close the current state and return seconds spent per state.
+        """
+        now = time.monotonic()
+        self.timings[self.state] = round(self.timings.get(self.state, 0.0) + now - self._entered_at, 2)
+        self._entered_at = now
+        return dict(self.timings)
+
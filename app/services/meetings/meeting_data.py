@@ -5,9 +5,13 @@ from typing import List
 from uuid import UUID as UUIDType
 from app.models.meeting import Meeting
 from app.schemas.meet import MeetingMetadataDetails,MeetingDetails
-from app.utils.s3 import generate_presigned_url,S3_BUCKET
+import re
+from app.utils.s3 import generate_presigned_url, read_s3_text, S3_BUCKET
 from app.core.errors import MeetingError, MeetingErrorMessages, ErrorCode
 from fastapi import status
+
+# Segment URLs in a served manifest must stay valid for a whole listening session
+PLAYBACK_URL_EXPIRES_SECONDS = 6 * 3600
 class MeetingService:
     def __init__(self, db: AsyncSession):
         self.db = db
@@ -25,8 +29,7 @@ class MeetingService:
                 status_code=status.HTTP_200_OK
             )
         return [MeetingMetadataDetails.model_validate(m) for m in meetings]
-    async def get_meeting(self, meeting_id: UUIDType, user_id: UUIDType) -> MeetingDetails:
-    
+    async def _get_user_meeting(self, meeting_id: UUIDType, user_id: UUIDType) -> Meeting:
         result = await self.db.execute(
             select(Meeting).where(Meeting.id==meeting_id,Meeting.user_id == user_id)
         )
@@ -37,8 +40,42 @@ class MeetingService:
                 message=MeetingErrorMessages.MEETING_NOT_FOUND,
                 status_code=status.HTTP_400_BAD_REQUEST
             )
+        return meeting
+
+    async def get_meeting(self, meeting_id: UUIDType, user_id: UUIDType) -> MeetingDetails:
+    
+        meeting = await self._get_user_meeting(meeting_id, user_id)
         audio_url = generate_presigned_url(S3_BUCKET, meeting.audio_object)
-        transcript = meeting
         meeting_data = MeetingDetails.model_validate(meeting)
         meeting_data.audio_url = audio_url
+        if meeting.playback_manifest:
+            meeting_data.playback_url = f"/meetings/{meeting.id}/playback.m3u8"
         return meeting_data
+
+    async def get_playback_manifest(self, meeting_id: UUIDType, user_id: UUIDType) -> str:
+        """
+        The meeting's HLS manifest with every segment (and the init section)
+        pointing at a presigned URL, so a player can fetch and seek in the
+        recording straight from S3.
+        """
+        meeting = await self._get_user_meeting(meeting_id, user_id)
+        manifest = read_s3_text(S3_BUCKET, meeting.playback_manifest) if meeting.playback_manifest else None
+        if manifest is None:
+            raise MeetingError(
+                error_code=ErrorCode.MEETING_NOT_FOUND,
+                message=MeetingErrorMessages.PLAYBACK_NOT_FOUND,
+                status_code=status.HTTP_404_NOT_FOUND
+            )
+        prefix = meeting.playback_manifest.rsplit("/", 1)[0]
+
+        def sign(name: str) -> str:
+            return generate_presigned_url(S3_BUCKET, f"{prefix}/{name}", expires_in=PLAYBACK_URL_EXPIRES_SECONDS)
+
+        lines = []
+        for line in manifest.splitlines():
+            if line.startswith("#EXT-X-MAP:"):
+                line = re.sub(r'URI="([^"]+)"', lambda m: f'URI="{sign(m.group(1))}"', line)
+            elif line and not line.startswith("#"):
+                line = sign(line)
+            lines.append(line)
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,207 @@
+import os
+import csv
+import logging
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional
+
+from app.schemas.transcript import TranscriptUtterance
+from app.services.meetings.audio_format import audio_format
+from app.utils.transcript import merge_utterances
+from app.utils.transcription import transcribe_utterances
+
+logger = logging.getLogger(__name__)
+
+ROLLING_TRANSCRIPTION_ENABLED = os.getenv("ROLLING_TRANSCRIPTION", "true").lower() == "true"
+# Length of the audio segments ffmpeg closes and hands over while recording
+TRANSCRIBE_SEGMENT_SECONDS = int(os.getenv("TRANSCRIBE_SEGMENT_SECONDS", "60"))
+ROLLING_TRANSCRIPTION_WORKERS = int(os.getenv("ROLLING_TRANSCRIPTION_WORKERS", "4"))
+# Seconds between checks of ffmpeg's segment list
+SEGMENT_POLL_SECONDS = float(os.getenv("SEGMENT_POLL_SECONDS", "1"))
+
+# Segments use the recording codec, so they upload to Deepgram as small as the recording
+SEGMENT_PATTERN = f"segment_%05d.{audio_format()['extension']}"
+SEGMENT_LIST = "segments.csv"
+# An utterance cut by a segment boundary ends/starts this close to it
+BOUNDARY_GAP_SECONDS = 1.0
+# Captions are finalized a little after the words were spoken
+CAPTION_LAG_SECONDS = 4.0
+
+
+def _caption_seconds(timestamp: str) -> float:
+    seconds = 0
+    for part in str(timestamp).split(":"):
+        seconds = seconds * 60 + int(part)
+    return seconds
+
+
+def _transcribe_segment(path: str) -> List[dict]:
+    # A segment of silence is fine, the meeting isn't empty
+    return transcribe_utterances(path, allow_empty=True)
+
+
+def stitch_segments(segments: List[dict], captions: Iterable[dict] = ()) -> List[dict]:
+    """
+    Join per-segment utterances into one meeting timeline.
+
+    segments: [{"start": offset in the recording, "end": ..., "utterances": [...]}] in order.
+    Times are shifted by the segment offset. Diarization labels are only
+    consistent within one request, so each segment's speakers are mapped to
+    meeting-wide ids: by the caption names spoken at the same time when
+    captions are available, else by continuity of an utterance cut at the
+    boundary, else as a new speaker.
+    """
+    caption_times = [(_caption_seconds(c["timestamp"]), c["speaker"]) for c in captions if c.get("timestamp")]
+    ids_by_name = {}
+    next_id = 0
+    stitched = []
+
+    for segment in segments:
+        offset = segment["start"]
+        utterances = [
+            {**utt, "start": utt["start"] + offset, "end": utt["end"] + offset}
+            for utt in segment["utterances"]
+        ]
+
+        # Step 1 — Vote a caption name for every local speaker: a caption belongs
+        # to the utterance that ended just before it, else to the one it falls in
+        votes = {utt["speaker"]: Counter() for utt in utterances}
+        for seconds, name in caption_times:
+            if not offset <= seconds <= segment["end"] + CAPTION_LAG_SECONDS:
+                continue
+            ended = [u for u in utterances if u["end"] <= seconds <= u["end"] + CAPTION_LAG_SECONDS]
+            during = [u for u in utterances if u["start"] <= seconds <= u["end"]]
+            utt = max(ended, key=lambda u: u["end"]) if ended else (during[0] if during else None)
+            if utt:
+                votes[utt["speaker"]][name] += 1
+
+        # Step 2 — Local speaker -> meeting-wide id
+        mapping = {}
+        if utterances and stitched:
+            first, last = utterances[0], stitched[-1]
+            if first["start"] - offset <= BOUNDARY_GAP_SECONDS and offset - last["end"] <= BOUNDARY_GAP_SECONDS:
+                mapping[first["speaker"]] = last["speaker"]
+        for local, names in votes.items():
+            if names:
+                name = names.most_common(1)[0][0]
+                if name not in ids_by_name:
+                    ids_by_name[name] = next_id
+                    next_id += 1
+                mapping[local] = ids_by_name[name]
+            elif local not in mapping:
+                mapping[local] = next_id
+                next_id += 1
+
+        stitched.extend({**utt, "speaker": mapping[utt["speaker"]]} for utt in utterances)
+    return stitched
+
+
+class RollingTranscriber:
+    """
+    Transcribes a recording while it is still running.
+
+    ffmpeg writes fixed-length segments next to the full recording and appends
+    every closed segment to a CSV list (name, start, end). Each closed segment is
+    transcribed in the background; handoff() returns them at hang-up without
+    waiting, and finish_segments() transcribes whatever was still in flight.
+    """
+
+    def __init__(
+        self,
+        segment_dir: str,
+        transcribe: Callable[[str], List[dict]] = None,
+        poll_interval: float = SEGMENT_POLL_SECONDS,
+        max_workers: int = ROLLING_TRANSCRIPTION_WORKERS,
+    ):
+        self.segment_dir = segment_dir
+        self.list_path = os.path.join(segment_dir, SEGMENT_LIST)
+        self.transcribe = transcribe or _transcribe_segment
+        self.poll_interval = poll_interval
+        self.segments = []
+        self._stop = threading.Event()
+        self._thread = None
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+        os.makedirs(segment_dir, exist_ok=True)
+
+    def start(self) -> "RollingTranscriber":
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        logger.info(f" Started rolling transcription of {self.segment_dir}")
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self._collect()
+            except Exception as e:
+                logger.warning(f" Rolling transcription check failed: {e}")
+
+    def _collect(self):
+        """
+        Submit segments ffmpeg closed since the last check.
+        """
+        if not os.path.exists(self.list_path):
+            return
+        with open(self.list_path, newline="") as f:
+            rows = [row for row in csv.reader(f) if len(row) == 3]
+        for name, start, end in rows[len(self.segments):]:
+            path = os.path.join(self.segment_dir, name)
+            future = self._executor.submit(self.transcribe, path)
+            self.segments.append({"path": path, "start": float(start), "end": float(end), "future": future})
+            logger.info(f" Transcribing segment {name} ({float(start):.0f}s-{float(end):.0f}s) in background")
+
+    def handoff(self) -> List[dict]:
+        """
+        Call once ffmpeg has exited; doesn't wait for transcriptions in flight.
+        Returns every segment as {path, start, end, utterances}, utterances None
+        where the transcription hadn't finished or failed (JSON-serializable).
+        """
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        try:
+            self._collect()
+        except Exception as e:
+            logger.warning(f" Rolling transcription check failed: {e}")
+
+        segments = []
+        for segment in self.segments:
+            future = segment["future"]
+            done = future.done() and not future.cancelled() and future.exception() is None
+            segments.append({
+                "path": segment["path"],
+                "start": segment["start"],
+                "end": segment["end"],
+                "utterances": future.result() if done else None,
+            })
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        pending = sum(segment["utterances"] is None for segment in segments)
+        logger.info(f" Rolling transcription handed off: {len(segments)} segments, {pending} still to transcribe")
+        return segments
+
+
+def finish_segments(
+    segments: List[dict],
+    captions: Iterable[dict] = (),
+    transcribe: Callable[[str], List[dict]] = None,
+    max_workers: int = ROLLING_TRANSCRIPTION_WORKERS,
+) -> Optional[List[TranscriptUtterance]]:
+    """
+    Transcribe the segments RollingTranscriber.handoff() returned without
+    utterances and stitch the transcript. Returns None when there are no
+    segments or one couldn't be transcribed (callers fall back to the full file).
+    """
+    if not segments:
+        return None
+    transcribe = transcribe or _transcribe_segment
+    segments = [dict(segment) for segment in segments]
+    pending = [segment for segment in segments if segment.get("utterances") is None]
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending) or 1))) as pool:
+            for segment, utterances in zip(pending, pool.map(lambda seg: transcribe(seg["path"]), pending)):
+                segment["utterances"] = utterances
+    except Exception as e:
+        logger.error(f" Rolling transcription failed: {e}")
+        return None
+    return merge_utterances(stitch_segments(segments, captions))
@@ -0,0 +1,125 @@
+import os
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List
+
+import httpx
+from dotenv import load_dotenv
+
+from app.core.errors import TranscriptionError
+from app.services.meetings.audio_format import audio_mimetype
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+DEEPGRAM_API_KEY = os.getenv("DEEPGRAM_API_KEY")
+# Point at benchmarks/fake_deepgram.py (e.g. http://127.0.0.1:8765) to run without Deepgram
+DEEPGRAM_API_URL = os.getenv("DEEPGRAM_API_URL", "https://api.deepgram.com")
+DEEPGRAM_TIMEOUT_SECONDS = float(os.getenv("DEEPGRAM_TIMEOUT_SECONDS", "300"))
+# Concurrent requests (and kept-alive connections) per process
+DEEPGRAM_MAX_CONNECTIONS = int(os.getenv("DEEPGRAM_MAX_CONNECTIONS", "8"))
+
+DEEPGRAM_OPTIONS = {
+    "model": "nova-3",
+    "language": "en-IN",
+    "punctuate": "true",
+    "diarize": "true",
+    "utterances": "true",
+    "smart_format": "true",
+}
+
+
+class DeepgramTranscriptionClient:
+    """
+    Deepgram pre-recorded transcription over one pooled HTTP client.
+
+    Files are streamed from disk in chunks instead of being read into memory,
+    connections are kept alive between requests, and the client is thread-safe,
+    so rolling-transcription segments and whole recordings share one pool.
+    """
+
+    def __init__(
+        self,
+        api_key: str = DEEPGRAM_API_KEY,
+        base_url: str = DEEPGRAM_API_URL,
+        timeout: float = DEEPGRAM_TIMEOUT_SECONDS,
+        max_connections: int = DEEPGRAM_MAX_CONNECTIONS,
+    ):
+        if not api_key:
+            raise TranscriptionError("Deepgram API key is missing", status_code=500)
+        self._client = httpx.Client(
+            base_url=base_url,
+            headers={"Authorization": f"Token {api_key}"},
+            timeout=httpx.Timeout(timeout, connect=10),
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_connections))
+
+    def transcribe(self, audio_file: str) -> dict:
+        """
+        Raw Deepgram response (JSON) for an audio file.
+        """
+        started = time.monotonic()
+        size = os.path.getsize(audio_file)
+        with open(audio_file, "rb") as f:
+            response = self._client.post(
+                "/v1/listen",
+                params=DEEPGRAM_OPTIONS,
+                content=f,  # streamed in chunks
+                headers={"Content-Type": audio_mimetype(audio_file), "Content-Length": str(size)},
+            )
+        if response.status_code != 200:
+            raise TranscriptionError(
+                f"Deepgram returned {response.status_code}: {response.text[:500]}", status_code=500
+            )
+        logger.info(f" Deepgram transcribed {audio_file} ({size / 1e6:.1f} MB) in {time.monotonic() - started:.1f}s")
+        return response.json()
+
+    def utterances(self, audio_file: str, allow_empty: bool = False) -> List[dict]:
+        """
+        Diarized utterances as dicts ({start, end, transcript, speaker}, times in seconds).
+        """
+        results = self.transcribe(audio_file).get("results") or {}
+        logger.debug(f"Deepgram results for {audio_file}: {results}")
+        utterances = results.get("utterances")
+        if not utterances:
+            if allow_empty:
+                return []
+            raise TranscriptionError("No utterances found in Deepgram response", status_code=500)
+        return [
+            {
+                "start": utt["start"],
+                "end": utt["end"],
+                "transcript": utt["transcript"],
+                "speaker": utt.get("speaker", 0),
+            }
+            for utt in utterances
+        ]
+
+    def utterances_many(self, audio_files: Iterable[str], allow_empty: bool = False) -> List[List[dict]]:
+        """
+        Transcribe several files concurrently; results are in input order.
+        """
+        return list(self._executor.map(lambda path: self.utterances(path, allow_empty), audio_files))
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+        self._client.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_deepgram_client() -> DeepgramTranscriptionClient:
+    """
+    The process-wide Deepgram client, created on first use.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = DeepgramTranscriptionClient()
+        return _client
@@ -1,8 +1,12 @@
 import os
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import boto3
+from boto3.s3.transfer import TransferConfig
 from pydantic import BaseModel
 from app.schemas.meet import S3UploadResponse
-import logging
 from botocore.exceptions import ClientError
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -12,20 +16,184 @@ AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
 AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
 AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
 S3_BUCKET = os.getenv("S3_BUCKET_NAME")
+# e.g. http://minio:9000 for the local MinIO; unset for AWS
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL") or None
+
+# Upload the recording part by part while it is being written
+S3_STREAMING_UPLOAD_ENABLED = os.getenv("S3_STREAMING_UPLOAD", "true").lower() == "true"
+# Multipart settings: S3 parts must be at least 5 MiB (except the last one)
+S3_PART_SIZE = max(5, int(os.getenv("S3_PART_SIZE_MB", "8"))) * 1024 * 1024
+S3_UPLOAD_CONCURRENCY = int(os.getenv("S3_UPLOAD_CONCURRENCY", "4"))
+# Seconds between checks of a growing file for completed parts
+S3_STREAM_POLL_SECONDS = float(os.getenv("S3_STREAM_POLL_SECONDS", "2"))
 
 s3_client = boto3.client(
     "s3",
     region_name=AWS_REGION,
+    endpoint_url=S3_ENDPOINT_URL,
     aws_access_key_id=AWS_ACCESS_KEY_ID,
     aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
 )
-def upload_to_s3(file_path: str, bucket: str, object_name: str) -> S3UploadResponse:
+transfer_config = TransferConfig(
+    multipart_threshold=S3_PART_SIZE,
+    multipart_chunksize=S3_PART_SIZE,
+    max_concurrency=S3_UPLOAD_CONCURRENCY,
+)
+def upload_to_s3(file_path: str, bucket: str, object_name: str, content_type: str = None) -> S3UploadResponse:
     try:
-        s3_client.upload_file(file_path, bucket, object_name)
+        extra_args = {"ContentType": content_type} if content_type else None
+        s3_client.upload_file(file_path, bucket, object_name, ExtraArgs=extra_args, Config=transfer_config)
         url = f"https://{bucket}.s3.{AWS_REGION}.amazonaws.com/{object_name}"
         return S3UploadResponse(status="success", object_name=object_name, url=url)
     except Exception as e:
         return S3UploadResponse(status="error", object_name=object_name, detail=str(e))
+class StreamingS3Upload:
+    """
+    Multipart upload of a file that is still being written (the recording).
+
+    A background thread sends every completed part_size chunk as ffmpeg writes
+    it, with up to max_workers parts in flight. finish() is called once the
+    writer has closed the file: it sends the tail, completes the upload and
+    returns an S3UploadResponse, aborting the multipart upload on any failure
+    so no orphaned parts are left behind. Part 1 is sent last because muxers
+    (WAV, FLAC) rewrite their header when they close the file.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        bucket: str,
+        object_name: str,
+        content_type: str = None,
+        part_size: int = S3_PART_SIZE,
+        max_workers: int = S3_UPLOAD_CONCURRENCY,
+        poll_interval: float = S3_STREAM_POLL_SECONDS,
+    ):
+        self.file_path = file_path
+        self.bucket = bucket
+        self.object_name = object_name
+        self.content_type = content_type
+        self.part_size = part_size
+        self.poll_interval = poll_interval
+        self.upload_id = None
+        self.sent = part_size  # bytes handed to part uploads (part 1 deferred)
+        self._futures = {}
+        self._error = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+
+    def start(self) -> "StreamingS3Upload":
+        extra_args = {"ContentType": self.content_type} if self.content_type else {}
+        response = s3_client.create_multipart_upload(Bucket=self.bucket, Key=self.object_name, **extra_args)
+        self.upload_id = response["UploadId"]
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        logger.info(f" Started streaming upload of {self.file_path} to s3://{self.bucket}/{self.object_name}")
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self._send_parts(final=False)
+            except Exception as e:
+                # Retried by the next check or by finish()
+                logger.warning(f" Streaming upload check failed: {e}")
+
+    def _send_parts(self, final: bool):
+        """
+        Submit every complete part written since the last check (and the tail when final).
+        """
+        if not os.path.exists(self.file_path):
+            return
+        size = os.path.getsize(self.file_path)
+        while size - self.sent >= self.part_size or (final and size > self.sent):
+            part_number = self.sent // self.part_size + 1
+            self._futures[part_number] = self._executor.submit(self._upload_part, part_number)
+            self.sent += min(self.part_size, size - self.sent)
+
+    def _read_part(self, part_number: int) -> bytes:
+        with open(self.file_path, "rb") as f:
+            f.seek((part_number - 1) * self.part_size)
+            return f.read(self.part_size)
+
+    def _upload_part(self, part_number: int) -> dict:
+        response = s3_client.upload_part(
+            Bucket=self.bucket, Key=self.object_name, UploadId=self.upload_id,
+            PartNumber=part_number, Body=self._read_part(part_number),
+        )
+        return {"PartNumber": part_number, "ETag": response["ETag"]}
+
+    def finish(self) -> S3UploadResponse:
+        """
+        Call after the writer closed the file. Sends the rest and completes the upload.
+        """
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        started = time.monotonic()
+        try:
+            self._send_parts(final=True)
+            # The (now final) header part
+            self._futures[1] = self._executor.submit(self._upload_part, 1)
+            parts = []
+            for number in sorted(self._futures):
+                try:
+                    parts.append(self._futures[number].result())
+                except ClientError as e:
+                    logger.warning(f" Part {number} failed, retrying: {e}")
+                    parts.append(self._upload_part(number))
+            s3_client.complete_multipart_upload(
+                Bucket=self.bucket, Key=self.object_name, UploadId=self.upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except Exception as e:
+            logger.error(f" Streaming upload of {self.file_path} failed: {e}")
+            self.abort()
+            return S3UploadResponse(status="error", object_name=self.object_name, detail=str(e))
+        finally:
+            self._executor.shutdown(wait=False)
+        logger.info(f" Completed streaming upload ({len(parts)} parts), {time.monotonic() - started:.1f}s after recording")
+        url = f"https://{self.bucket}.s3.{AWS_REGION}.amazonaws.com/{self.object_name}"
+        return S3UploadResponse(status="success", object_name=self.object_name, url=url)
+
+    def abort(self) -> None:
+        """
+        Drop the multipart upload and every part sent so far (e.g. the bot never joined).
+        """
+        self._stop.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        if self.upload_id:
+            try:
+                s3_client.abort_multipart_upload(Bucket=self.bucket, Key=self.object_name, UploadId=self.upload_id)
+            except ClientError as e:
+                logger.warning(f" Could not abort multipart upload {self.upload_id}: {e}")
+            self.upload_id = None
+
+
+def download_from_s3(bucket: str, object_name: str, file_path: str) -> bool:
+    """
+    Download an S3 object to a local file. Returns False on failure.
+    """
+    try:
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        s3_client.download_file(bucket, object_name, file_path)
+        return True
+    except Exception as e:
+        logger.error(f"Failed to download s3://{bucket}/{object_name}: {e}")
+        return False
+def read_s3_text(bucket: str, object_name: str) -> str:
+    """
+    Contents of a small text object (e.g. a playback manifest). Returns None on failure.
+    """
+    try:
+        response = s3_client.get_object(Bucket=bucket, Key=object_name)
+        return response["Body"].read().decode("utf-8")
+    except ClientError as e:
+        logger.error(f"Failed to read s3://{bucket}/{object_name}: {e}")
+        return None
 def generate_presigned_url(bucket_name: str, object_name: str, expires_in: int = 3600) -> str:
     """
     Generate a temporary signed URL for an S3 object.
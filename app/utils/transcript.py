@@ -8,14 +8,13 @@ from typing import List
 import json
 from app.schemas.transcript import TranscriptUtterance
 from app.core.errors import TranscriptionError
-from deepgram import DeepgramClient
+from app.utils.deepgram_client import get_deepgram_client
 
 logger = logging.getLogger(__name__)
 
 
 load_dotenv()
 aai.settings.api_key = os.getenv("ASSEMBLYAI_API_KEY")
-DEEPGRAM_API_KEY = os.getenv("DEEPGRAM_API_KEY")
 
 def format_timestamp(ms: int) -> str:
     """Convert milliseconds to HH:MM:SS string."""
@@ -28,60 +27,25 @@ def format_timestamp(ms: int) -> str:
     else:
         return f"{mins:02d}:{secs:02d}"
 def transcribe_file_json_deepgram(audio_file: str) -> List[TranscriptUtterance]:
-    try:
-        logger.info(f"Transcribing audio file with Deepgram v3: {audio_file}")
-        
-        if not DEEPGRAM_API_KEY:
-            raise TranscriptionError("Deepgram API key is missing", status_code=500)
-
-        # Initialize Deepgram v3 client
-        dg_client = DeepgramClient(api_key=DEEPGRAM_API_KEY)
-
-        with open(audio_file, "rb") as f:
-            source = {"buffer": f.read(), "mimetype": "audio/wav"}
-            
-            options = {
-                "punctuate": True,
-                "diarize": True,
-                "utterances": True,
-                "language": "en-IN",
-                "model": "nova-3",  # Specify model for better results
-                "smart_format": True,  # Enhanced formatting
-
-            }
-            response = dg_client.listen.prerecorded.v("1").transcribe_file(source, options,timeout=300)
-            logger.error(f"Deepgram raw response: {response}")
-
-
-        # Check if response has the expected structure
-        if not hasattr(response, 'results') or not response.results:
-            raise TranscriptionError("Invalid response from Deepgram", status_code=500)
-
-        # Access utterances from the response
-        if not hasattr(response.results, 'utterances') or not response.results.utterances:
-            raise TranscriptionError("No utterances found in Deepgram response", status_code=500)
-
-        dg_utterances = response.results.utterances
-
-        # Convert to list of dicts for merge_utterances function
-        utterance_dicts = []
-        for utt in dg_utterances:
-            utterance_dicts.append({
-                "start": utt.start,
-                "end": utt.end,
-                "transcript": utt.transcript,
-                "speaker": getattr(utt, 'speaker', 0)  # Some versions might not have speaker
-            })
-
-        # Merge consecutive utterances with same speaker
-        utterances = merge_utterances(utterance_dicts)
+    """
+    Transcribe an audio file with Deepgram, consecutive utterances of a speaker merged.
+    """
+    return merge_utterances(deepgram_utterances(audio_file))
 
-        return utterances
 
+def deepgram_utterances(audio_file: str, allow_empty: bool = False) -> List[dict]:
+    """
+    Diarized Deepgram utterances of an audio file as dicts
+    ({start, end, transcript, speaker}, times in seconds).
+    allow_empty: return [] for audio without speech (e.g. a silent recording segment).
+    """
+    try:
+        logger.info(f"Transcribing audio file with Deepgram: {audio_file}")
+        return get_deepgram_client().utterances(audio_file, allow_empty=allow_empty)
     except TranscriptionError:
         raise
     except Exception as e:
-        logger.error(f"Failed to transcribe with Deepgram v3: {e}")
+        logger.error(f"Failed to transcribe with Deepgram: {e}")
         raise TranscriptionError(message=str(e), status_code=500)
 
 
@@ -91,8 +55,24 @@ def transcribe_file_json_aai(audio_file: str) -> List[TranscriptUtterance]:
     Returns a list of TranscriptUtterance models with HH:MM:SS timestamps.
     Raises TranscriptionError on failure.
     """
+    return [
+        TranscriptUtterance(
+            start_time=format_timestamp(int(utt["start"] * 1000)),
+            end_time=format_timestamp(int(utt["end"] * 1000)),
+            text=utt["transcript"],
+            speaker=utt["speaker"]
+        )
+        for utt in assemblyai_utterances(audio_file)
+    ]
+
+
+def assemblyai_utterances(audio_file: str, allow_empty: bool = False) -> List[dict]:
+    """
+    Diarized AssemblyAI utterances of an audio file as dicts, in the same shape
+    as deepgram_utterances ({start, end, transcript, speaker}, times in seconds).
+    """
     try:
-        logger.info(f" Transcribing audio file: {audio_file}")
+        logger.info(f" Transcribing audio file with AssemblyAI: {audio_file}")
 
         config = aai.TranscriptionConfig(
             speech_model=aai.SpeechModel.universal,
@@ -106,19 +86,21 @@ def transcribe_file_json_aai(audio_file: str) -> List[TranscriptUtterance]:
         if transcript.status == "error":
             raise TranscriptionError(message=f"Transcription failed: {transcript.error}")
 
-        # Build structured transcript using utterances and Pydantic schema
-        utterances = [
-            TranscriptUtterance(
-                start_time=format_timestamp(utt.start),
-                end_time=format_timestamp(utt.end),
-                text=utt.text,
-                speaker=utt.speaker
-            )
+        if not transcript.utterances:
+            if allow_empty:
+                return []
+            raise TranscriptionError("No utterances found in AssemblyAI response", status_code=500)
+
+        return [
+            {
+                "start": utt.start / 1000,
+                "end": utt.end / 1000,
+                "transcript": utt.text,
+                "speaker": utt.speaker,
+            }
             for utt in transcript.utterances
         ]
 
-        return utterances
-
     except TranscriptionError:
         raise
     except Exception as e:
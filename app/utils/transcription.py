@@ -0,0 +1,270 @@
+import os
+import time
+import logging
+import threading
+from collections import deque
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+from app.core.errors import TranscriptionError
+from app.schemas.transcript import TranscriptUtterance
+from app.utils.transcript import deepgram_utterances, assemblyai_utterances, merge_utterances
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Providers in order of preference; later ones are hedges / fallbacks
+TRANSCRIPTION_PROVIDERS = [
+    name.strip().lower()
+    for name in os.getenv("TRANSCRIPTION_PROVIDERS", "deepgram,assemblyai").split(",")
+    if name.strip()
+]
+# Start the next provider when the running one is slower than its own p95
+TRANSCRIPTION_HEDGE_ENABLED = os.getenv("TRANSCRIPTION_HEDGE", "true").lower() == "true"
+# Hedge delay until a provider has TRANSCRIPTION_HEDGE_MIN_SAMPLES latencies
+TRANSCRIPTION_HEDGE_DEFAULT_SECONDS = float(os.getenv("TRANSCRIPTION_HEDGE_DEFAULT_SECONDS", "60"))
+TRANSCRIPTION_HEDGE_MIN_SAMPLES = int(os.getenv("TRANSCRIPTION_HEDGE_MIN_SAMPLES", "20"))
+TRANSCRIPTION_LATENCY_WINDOW = int(os.getenv("TRANSCRIPTION_LATENCY_WINDOW", "200"))
+TRANSCRIPTION_WORKERS = int(os.getenv("TRANSCRIPTION_WORKERS", "16"))
+
+# Per-provider timeouts, overridable with TRANSCRIPTION_TIMEOUT_<PROVIDER>
+DEFAULT_TIMEOUTS = {"deepgram": 300.0, "assemblyai": 900.0}
+
+PROVIDERS: Dict[str, Callable[..., List[dict]]] = {
+    "deepgram": deepgram_utterances,
+    "assemblyai": assemblyai_utterances,
+}
+PROVIDER_KEYS = {"deepgram": "DEEPGRAM_API_KEY", "assemblyai": "ASSEMBLYAI_API_KEY"}
+
+
+def provider_timeout(name: str) -> float:
+    return float(os.getenv(f"TRANSCRIPTION_TIMEOUT_{name.upper()}", DEFAULT_TIMEOUTS.get(name, 300.0)))
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def normalize_speakers(utterances: List[dict]) -> List[dict]:
+    """
+    Speaker labels as integers like Deepgram's (AssemblyAI labels speakers "A", "B", ...),
+    numbered in order of first appearance.
+    """
+    if all(isinstance(utt["speaker"], int) for utt in utterances):
+        return utterances
+    ids = {}
+    return [{**utt, "speaker": ids.setdefault(utt["speaker"], len(ids))} for utt in utterances]
+
+
+class ProviderMetrics:
+    """
+    Request, error, timeout and hedge counts plus recent latencies of one provider.
+    Latencies are kept per MB of audio, so a p95 learned on one-minute
+    segments also applies to a two-hour recording.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.requests = 0
+        self.successes = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.hedges = 0      # started as a hedge
+        self.hedge_wins = 0  # ... and answered first
+        self._latencies = deque(maxlen=TRANSCRIPTION_LATENCY_WINDOW)  # (seconds, seconds per MB)
+        self._lock = threading.Lock()
+
+    def record(self, outcome: str, latency: float = None, size_mb: float = None) -> None:
+        with self._lock:
+            if outcome == "success":
+                self.successes += 1
+                self._latencies.append((latency, latency / max(size_mb, 1.0)))
+            elif outcome == "timeout":
+                self.timeouts += 1
+            else:
+                self.errors += 1
+
+    def start(self, hedge: bool) -> None:
+        with self._lock:
+            self.requests += 1
+            self.hedges += int(hedge)
+
+    def hedge_won(self) -> None:
+        with self._lock:
+            self.hedge_wins += 1
+
+    def hedge_delay(self, size_mb: float) -> float:
+        """
+        Seconds after which a request for size_mb of audio is slower than this provider's p95.
+        """
+        with self._lock:
+            if len(self._latencies) < TRANSCRIPTION_HEDGE_MIN_SAMPLES:
+                return TRANSCRIPTION_HEDGE_DEFAULT_SECONDS
+            return _percentile([per_mb for _, per_mb in self._latencies], 0.95) * max(size_mb, 1.0)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            latencies = [seconds for seconds, _ in self._latencies]
+            return {
+                "requests": self.requests,
+                "successes": self.successes,
+                "errors": self.errors,
+                "timeouts": self.timeouts,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+                "latency_p50_s": round(_percentile(latencies, 0.5), 2) if latencies else None,
+                "latency_p95_s": round(_percentile(latencies, 0.95), 2) if latencies else None,
+            }
+
+
+class HedgedTranscriber:
+    """
+    Transcribes with the first provider and, if it hasn't answered after its
+    p95 latency, starts the next one as well; the first answer wins. A provider
+    that fails or exceeds its timeout is failed over to the next one.
+    Returns utterances normalized to deepgram_utterances' shape.
+    """
+
+    def __init__(self, providers: List[str] = None, hedge: bool = TRANSCRIPTION_HEDGE_ENABLED):
+        names = providers or TRANSCRIPTION_PROVIDERS
+        self.providers = [name for name in names if name in PROVIDERS and os.getenv(PROVIDER_KEYS[name])]
+        for name in set(names) - set(self.providers):
+            logger.warning(f" Transcription provider {name!r} unknown or without API key, skipped")
+        if not self.providers:
+            raise TranscriptionError("No transcription provider is configured", status_code=500)
+        self.hedge = hedge
+        self.metrics = {name: ProviderMetrics(name) for name in self.providers}
+        # Calls already counted as timeouts; their late outcome isn't recorded again
+        self._timed_out = set()
+        self._timed_out_lock = threading.Lock()
+        # Abandoned (timed out / hedged) calls keep their thread until they return
+        self._executor = ThreadPoolExecutor(max_workers=max(len(self.providers), TRANSCRIPTION_WORKERS))
+
+    def _call(self, name: str, audio_file: str, allow_empty: bool) -> List[dict]:
+        utterances = PROVIDERS[name](audio_file, allow_empty=allow_empty)
+        # An empty answer the caller can't use is a failure of this provider
+        if not utterances and not allow_empty:
+            raise TranscriptionError(f"No utterances found in {name} response", status_code=500)
+        return normalize_speakers(utterances)
+
+    def _record(self, name: str, started: float, size_mb: float, future) -> None:
+        """
+        Outcome of every call, including ones that lost a hedge or timed out,
+        so slow answers still count towards the p95. Timed-out calls were
+        already counted when they were abandoned.
+        """
+        with self._timed_out_lock:
+            if future in self._timed_out:
+                self._timed_out.discard(future)
+                return
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            self.metrics[name].record("error")
+        else:
+            self.metrics[name].record("success", time.monotonic() - started, size_mb)
+
+    def utterances(self, audio_file: str, allow_empty: bool = False) -> List[dict]:
+        size_mb = os.path.getsize(audio_file) / 1e6
+        waiting = list(self.providers)
+        running = {}  # future -> (provider, started, hedge)
+        errors = {}
+
+        def launch(reason: str = None):
+            name = waiting.pop(0)
+            hedge = reason == "hedge"
+            self.metrics[name].start(hedge)
+            started = time.monotonic()
+            future = self._executor.submit(self._call, name, audio_file, allow_empty)
+            future.add_done_callback(partial(self._record, name, started, size_mb))
+            running[future] = (name, started, hedge)
+            if reason:
+                logger.info(f" Transcription of {audio_file}: starting {name} ({reason})")
+
+        launch()
+        while running:
+            now = time.monotonic()
+            deadlines = [started + provider_timeout(name) for name, started, _ in running.values()]
+            if self.hedge and waiting:
+                deadlines += [
+                    max(started + self.metrics[name].hedge_delay(size_mb) for name, started, _ in running.values())
+                ]
+            done, _ = wait(list(running), timeout=max(0.0, min(deadlines) - now), return_when=FIRST_COMPLETED)
+
+            for future in done:
+                name, started, hedge = running.pop(future)
+                try:
+                    utterances = future.result()
+                except Exception as e:
+                    errors[name] = str(e)
+                    logger.warning(f" Transcription provider {name} failed: {e}")
+                    continue
+                if hedge:
+                    self.metrics[name].hedge_won()
+                for other in running:
+                    other.cancel()
+                return utterances
+
+            now = time.monotonic()
+            for future, (name, started, _) in list(running.items()):
+                if now - started >= provider_timeout(name):
+                    with self._timed_out_lock:
+                        # Answered just now: handled by the next wait instead
+                        if future.done():
+                            continue
+                        self._timed_out.add(future)
+                    running.pop(future)
+                    future.cancel()
+                    self.metrics[name].record("timeout")
+                    errors[name] = f"timed out after {provider_timeout(name):.0f}s"
+                    logger.warning(f" Transcription provider {name} timed out")
+
+            if waiting and not running:
+                launch("failover")
+            elif self.hedge and waiting and all(
+                now - started >= self.metrics[name].hedge_delay(size_mb) for name, started, _ in running.values()
+            ):
+                launch("hedge")
+
+        raise TranscriptionError(f"All transcription providers failed: {errors}", status_code=500)
+
+    def metrics_snapshot(self) -> Dict[str, dict]:
+        return {name: metrics.snapshot() for name, metrics in self.metrics.items()}
+
+
+_transcriber: Optional[HedgedTranscriber] = None
+_transcriber_lock = threading.Lock()
+
+
+def get_transcriber() -> HedgedTranscriber:
+    """
+    The process-wide transcriber (metrics and latency history are per process).
+    """
+    global _transcriber
+    with _transcriber_lock:
+        if _transcriber is None:
+            _transcriber = HedgedTranscriber()
+        return _transcriber
+
+
+def transcribe_utterances(audio_file: str, allow_empty: bool = False) -> List[dict]:
+    """
+    Raw utterances ({start, end, transcript, speaker}, seconds) from the fastest healthy provider.
+    """
+    return get_transcriber().utterances(audio_file, allow_empty=allow_empty)
+
+
+def transcribe_audio(audio_file: str) -> List[TranscriptUtterance]:
+    """
+    Transcribe an audio file, consecutive utterances of a speaker merged.
+    """
+    return merge_utterances(transcribe_utterances(audio_file))
+
+
+def transcription_metrics() -> Dict[str, dict]:
+    return get_transcriber().metrics_snapshot() if _transcriber else {}
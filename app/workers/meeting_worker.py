@@ -1,127 +1,726 @@
 from datetime import datetime, timezone
-from celery import Celery
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from celery import Celery, chain, chord
+from celery.signals import worker_ready, worker_shutdown
 import os
+import time
+import uuid
 import logging
 import shutil
+import threading
 
 from app.services.meetings.join_meeting import join_and_record_meeting, process_meeting_transcript
-from app.utils.transcript import transcribe_file_json_deepgram
+from app.utils.transcription import transcribe_audio, transcription_metrics
 from app.schemas.meet import MeetRequest
 from app.db.session import SessionLocal  # <- sync session for Celery
 from app.models.meeting import Meeting
-from app.utils.s3 import upload_to_s3, S3_BUCKET
-from app.services.meeting_pipeline.summarizer import generate_meeting_summary as generate_langchain_summary
-from chatbot.indexing import index_meeting
+from app.utils.s3 import (
+    upload_to_s3,
+    download_from_s3,
+    StreamingS3Upload,
+    S3_BUCKET,
+    S3_STREAMING_UPLOAD_ENABLED,
+)
+from app.services.meetings.checkpoint import CheckpointStore, sweep_checkpoints
+from app.services.meetings.browser_pool import get_browser_pool, shutdown_browser_pool
+from app.services.meetings.caption_stream import CaptionStream, CAPTION_STREAM_TTL_SECONDS
+from app.services.meetings.audio_format import (
+    recording_filename,
+    audio_mimetype,
+    PLAYBACK_DIR,
+    PLAYBACK_MANIFEST,
+    PLAYBACK_SEGMENTS_ENABLED,
+)
+from app.services.meetings.rolling_transcription import (
+    RollingTranscriber,
+    finish_segments,
+    ROLLING_TRANSCRIPTION_ENABLED,
+)
+from app.services.meeting_pipeline.summarizer import (
+    summarize_segment_chunks,
+    generate_meeting_summary_from_chunks,
+)
+from app.services.meeting_pipeline.incremental import (
+    IncrementalSummarizer,
+    INCREMENTAL_SUMMARY_ENABLED,
+    summarize_pending_chunks,
+)
+from app.services.meeting_pipeline.progress import SummaryProgressPublisher
+from chatbot.indexing import index_meeting, index_meeting_summary_tree
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 BASE_AUDIO_DIR = "/tmp/meetings"
 
+# "staged": post-recording stages run as Celery tasks on their own queues
+# "inprocess": they run concurrently inside the recording task (single-worker setups)
+MEETING_PIPELINE_MODE = os.getenv("MEETING_PIPELINE_MODE", "staged").lower()
+
+# Branches whose failure is logged but doesn't fail the meeting
+OPTIONAL_STAGES = {"upload", "index"}
+
 celery_app = Celery(
     "meeting_worker",
     broker="redis://localhost:6379/0",
     backend="redis://localhost:6379/0"
 )
 
+# Browser-bound work runs on the "recording" queue; everything after hang-up runs
+# on I/O queues so each can be scaled separately and a bot slot is freed as soon
+# as the call ends.
+celery_app.conf.task_routes = {
+    "app.workers.meeting_worker.record_meeting_task": {"queue": "recording"},
+    "app.workers.meeting_worker.transcribe_meeting_task": {"queue": "transcription"},
+    "app.workers.meeting_worker.upload_audio_task": {"queue": "transcription"},
+    "app.workers.meeting_worker.index_meeting_task": {"queue": "embedding"},
+    "app.workers.meeting_worker.summarize_meeting_task": {"queue": "summarization"},
+    "app.workers.meeting_worker.save_meeting_task": {"queue": "summarization"},
+}
+# A recording worker must not reserve a second meeting while it is in a call
+celery_app.conf.worker_prefetch_multiplier = 1
+
+
+# Only recording workers keep warm browsers
+BROWSER_POOL_PREWARM = os.getenv("BROWSER_POOL_PREWARM", "false").lower() == "true"
+
 
-@celery_app.task
-def record_meeting_task(job_data: dict):
+@worker_ready.connect
+def prewarm_browser_pool(**kwargs):
+    # Recording workers run solo/threads pools, so tasks share this process.
+    # Launch in the background; the first task waits on the pool lock if needed.
+    if BROWSER_POOL_PREWARM:
+        threading.Thread(target=get_browser_pool, daemon=True).start()
+
+
+@worker_shutdown.connect
+def close_browser_pool(**kwargs):
+    # Don't leave pre-warmed Chrome/chromedriver processes behind the worker
+    shutdown_browser_pool()
+
+
+# ---------- Celery tasks ----------
+
+@celery_app.task(bind=True)
+def record_meeting_task(self, job_data: dict):
     """
-    Celery task to record meeting + generate transcript + capture captions.
-    Fully sync-safe for DB operations.
+    Celery task to join and record the meeting (recording queue).
+    Queues the post-recording pipeline and returns as soon as the call ends.
     """
-    run_meeting_task(job_data)
+    if MEETING_PIPELINE_MODE == "inprocess":
+        run_meeting_task(job_data, job_id=self.request.id)
+        return
+
+    # A redelivered task finds the recording checkpoint and goes straight to the next stages
+    ctx = build_job_context(job_data, job_id=self.request.id)
+    ctx.update(run_stage(ctx, "record", record_stage))
+    ensure_recorded(ctx)
+    build_post_recording_pipeline(ctx).apply_async()
+
+
+# Post-recording tasks are retried; completed stages are restored from their checkpoints
+RETRY_OPTIONS = {"bind": True, "autoretry_for": (Exception,), "retry_backoff": True, "max_retries": 3}
+
+
+@celery_app.task(**RETRY_OPTIONS)
+def transcribe_meeting_task(self, ctx: dict) -> dict:
+    return run_task_stage(self, ctx, "transcribe", transcribe_stage)
 
 
-def run_meeting_task(job_data: dict):
-    request_dict = job_data["request"]
+@celery_app.task(**RETRY_OPTIONS)
+def upload_audio_task(self, ctx: dict) -> dict:
+    return run_task_stage(self, ctx, "upload", upload_stage)
+
+
+@celery_app.task(**RETRY_OPTIONS)
+def index_meeting_task(self, ctx: dict) -> dict:
+    return run_task_stage(self, ctx, "index", index_stage)
+
+
+@celery_app.task(**RETRY_OPTIONS)
+def summarize_meeting_task(self, ctx: dict) -> dict:
+    return run_task_stage(self, ctx, "summarize", summarize_stage)
+
+
+@celery_app.task(**RETRY_OPTIONS)
+def save_meeting_task(self, branch_results: list) -> str:
+    # Every branch carries the shared pre-chord context plus the outputs of its own
+    # stages; only those outputs are merged, so one branch's stale copy of a key
+    # never overwrites what another branch produced
+    ctx = dict(branch_results[0])
+    stage_timings = {}
+    for result in branch_results:
+        stage_timings.update(result.get("stage_timings", {}))
+        merge_outputs(ctx, result.get(BRANCH_OUTPUTS_KEY, {}))
+    ctx.pop(BRANCH_OUTPUTS_KEY, None)
+    ctx["stage_timings"] = stage_timings
+    ctx.update(run_task_stage(self, ctx, "save", save_stage))
+    cleanup_job_files(ctx)
+    return ctx["meeting_id"]
+
+
+# Outputs of the stages run so far in a chord branch (see save_meeting_task)
+BRANCH_OUTPUTS_KEY = "branch_outputs"
+
+
+def merge_outputs(ctx: dict, outputs: dict) -> dict:
+    """
+    Merge stage outputs into ctx (in place). A None output never replaces a value
+    that is already set, so a stage that didn't produce a key can't clear it.
+    """
+    ctx.update({key: value for key, value in outputs.items() if value is not None or ctx.get(key) is None})
+    return ctx
+
+
+def run_task_stage(task, ctx: dict, name: str, stage) -> dict:
+    """
+    Run one stage inside a Celery task and return the context plus its outputs;
+    the outputs are also accumulated under BRANCH_OUTPUTS_KEY for the chord's merge.
+    A failed optional stage returns the context unchanged so the chord still saves the meeting.
+    Failures are only reported to the summary stream once retries are exhausted.
+    """
+    final_attempt = task.request.retries >= task.max_retries
+    required = name not in OPTIONAL_STAGES
+    try:
+        outputs = run_stage(ctx, name, stage, report_failure=required and final_attempt)
+        return {**ctx, **outputs, BRANCH_OUTPUTS_KEY: {**ctx.get(BRANCH_OUTPUTS_KEY, {}), **outputs}}
+    except Exception as e:
+        if required or not final_attempt:
+            raise
+        logger.warning(f"[{ctx.get('job_id')}] Optional stage '{name}' skipped: {e}")
+        return ctx
+
+
+def build_post_recording_pipeline(ctx: dict):
+    """
+    Branches run in parallel and all feed save:
+        upload
+        transcribe → index
+        summarize  (from live caption windows; without them it runs after index,
+                    on the merged transcript)
+    """
+    transcript_branch = chain(transcribe_meeting_task.s(ctx), index_meeting_task.s())
+    branches = [upload_audio_task.s(ctx)]
+    if ctx.get("caption_chunks"):
+        branches += [transcript_branch, summarize_meeting_task.s(ctx)]
+    else:
+        branches.append(transcript_branch | summarize_meeting_task.s())
+    return chord(branches, save_meeting_task.s())
+
+
+def run_meeting_task(job_data: dict, job_id: str = None):
+    """
+    Run the whole pipeline in-process: record, then the post-recording
+    stages concurrently, then save (MEETING_PIPELINE_MODE=inprocess, local runs).
+    """
+    ctx = build_job_context(job_data, job_id=job_id)
+    ctx.update(run_stage(ctx, "record", record_stage))
+    ensure_recorded(ctx)
+    return run_post_recording_pipeline(ctx)
+
+
+def ensure_recorded(ctx: dict) -> None:
+    """
+    Fail the job when the bot never got into the call: there is nothing to
+    transcribe, upload or summarize, so the post-recording stages aren't queued.
+    """
+    if ctx.get("recorded_file"):
+        return
+    message = "The bot could not join the meeting, nothing was recorded"
+    logger.error(f"[{ctx['job_id']}] {message}")
+    progress = get_progress(ctx)
+    if progress:
+        progress.publish("error", {"stage": "record", "message": message})
+    cleanup_job_files(ctx)
+    raise RuntimeError(message)
+
+
+def run_post_recording_pipeline(ctx: dict) -> dict:
+    merge_outputs(ctx, run_post_recording_stages(ctx))
+    ctx.update(run_stage(ctx, "save", save_stage))
+    cleanup_job_files(ctx)
+    return ctx
+
+
+def run_post_recording_stages(ctx: dict) -> dict:
+    """
+    In-process version of build_post_recording_pipeline: independent stages run
+    concurrently on threads, so the post-recording time is about the slowest branch.
+    """
+    # Timed as one branch ("transcript") and per sub-stage
+    def transcript_branch(ctx: dict) -> dict:
+        outputs = run_stage(ctx, "transcribe", transcribe_stage)
+        followups = {"index": index_stage}
+        if not ctx.get("caption_chunks"):
+            followups["summarize"] = summarize_stage
+        return merge_outputs(dict(outputs), run_stages_concurrently({**ctx, **outputs}, followups))
+
+    branches = {"upload": upload_stage, "transcript": transcript_branch}
+    if ctx.get("caption_chunks"):
+        branches["summarize"] = summarize_stage
+    return run_stages_concurrently(ctx, branches)
+
+
+def run_stages_concurrently(ctx: dict, stages: dict) -> dict:
+    """
+    Run independent stages ({name: stage_fn}) on a thread pool and merge their outputs.
+    Every branch runs to completion; failures of OPTIONAL_STAGES are logged and
+    skipped, any other failure is raised once all branches have finished.
+    """
+    outputs = {}
+    failures = {}
+
+    def run(name, stage):
+        if name in CHECKPOINTED_STAGES:
+            return run_stage(ctx, name, stage, report_failure=name not in OPTIONAL_STAGES)
+        with pipeline_stage(ctx, name):
+            return stage(ctx)
+
+    with ThreadPoolExecutor(max_workers=len(stages)) as pool:
+        futures = {pool.submit(run, name, stage): name for name, stage in stages.items()}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                merge_outputs(outputs, future.result())
+            except Exception as e:
+                failures[name] = e
+
+    for name, error in failures.items():
+        if name in OPTIONAL_STAGES:
+            logger.warning(f"[{ctx.get('job_id')}] Optional stage '{name}' skipped: {error}")
+    required_failures = [error for name, error in failures.items() if name not in OPTIONAL_STAGES]
+    if required_failures:
+        raise required_failures[0]
+    return outputs
+
+
+def reprocess_meeting(job_id: str, from_stage: str = None, inprocess: bool = False) -> dict:
+    """
+    Resume (or redo from from_stage) the post-recording pipeline of a recorded job.
+    Completed stages are restored from their checkpoints; a meeting that was
+    already saved is updated in place instead of being inserted again.
+    """
+    checkpoints = CheckpointStore(job_id)
+    ctx = checkpoints.load_context()
+    if ctx is None or "record" not in checkpoints.completed_stages():
+        raise ValueError(f"No recording checkpoint for job {job_id}")
+    if from_stage == "record":
+        raise ValueError("A meeting cannot be recorded again; reprocess from 'transcribe' or later")
+    if not ctx.get("recorded_file"):
+        raise ValueError(f"Job {job_id} has no recording to reprocess")
+    # Captions live only in the Redis stream; without them the merged transcript
+    # would come back empty and the saved captions would be overwritten
+    if ctx.get("caption_stream") and not CaptionStream(job_id).exists():
+        raise ValueError(
+            f"Captions of job {job_id} expired after {CAPTION_STREAM_TTL_SECONDS // 86400} days; it can't be reprocessed"
+        )
+
+    if from_stage:
+        dropped = checkpoints.invalidate(from_stage)
+        logger.info(f"[{job_id}] Reprocessing, dropped checkpoints: {dropped}")
+        ctx = {**checkpoints.load_context(), "meeting_id": ctx.get("meeting_id")}
+        if from_stage == "transcribe":
+            # Transcribe again from the audio, not from the live (rolling) transcript
+            ctx.pop("rolling_segments", None)
+    ctx["stage_timings"] = {}
+    progress = get_progress(ctx)
+    if progress:
+        progress.reset()
+
+    if inprocess:
+        return run_post_recording_pipeline(ctx)
+    build_post_recording_pipeline(ctx).apply_async()
+    return ctx
+
+
+# ---------- Pipeline stages ----------
+# Every stage takes the JSON-serializable job context and returns the keys it adds.
+
+def build_job_context(job_data: dict, job_id: str = None) -> dict:
+    """
+    New job context, or the checkpointed one when the job id was seen before.
+    """
+    job_id = job_id or str(uuid.uuid4())
+    checkpoints = CheckpointStore(job_id)
+    saved = checkpoints.load_context()
+    if saved is not None:
+        logger.info(f"[{job_id}] Resuming job, completed stages: {checkpoints.completed_stages()}")
+        return saved
+
+    request = MeetRequest(**job_data["request"])
     user_id = job_data["user_id"]
-    request = MeetRequest(**request_dict)
 
     timestamp = datetime.now().strftime("%Y%m%dT%H%M%S")
-    meeting_id = request.meet_url.replace("https://", "").replace("/", "_")
-    meeting_folder = os.path.join(BASE_AUDIO_DIR, str(user_id), meeting_id, timestamp)
+    meeting_key = request.meet_url.replace("https://", "").replace("/", "_")
+    meeting_folder = os.path.join(BASE_AUDIO_DIR, str(user_id), meeting_key, timestamp)
     os.makedirs(meeting_folder, exist_ok=True)
 
-    audio_file = os.path.join(meeting_folder, "meeting_audio.wav")
+    ctx = {
+        "job_id": job_id,
+        "request": request.model_dump(),
+        "user_id": str(user_id),
+        "timestamp": timestamp,
+        "meeting_key": meeting_key,
+        "meeting_folder": meeting_folder,
+        "audio_file": os.path.join(meeting_folder, recording_filename()),
+        # Seekable HLS rendition of the recording, uploaded next to it
+        "playback_dir": os.path.join(meeting_folder, PLAYBACK_DIR) if PLAYBACK_SEGMENTS_ENABLED else None,
+        # Seconds spent in each stage, shared by all branches of the job
+        "stage_timings": {},
+    }
+    checkpoints.save("context", ctx)
+    return ctx
+
+
+def get_progress(ctx: dict):
+    # Partial summaries are published under the job id for the summary stream endpoint
+    return SummaryProgressPublisher(ctx["job_id"]) if ctx.get("job_id") else None
+
+
+# Stages whose outputs are saved under the job id (see CheckpointStore)
+CHECKPOINTED_STAGES = {"record", "transcribe", "upload", "index", "summarize", "save"}
+
+
+def run_stage(ctx: dict, name: str, stage, report_failure: bool = True) -> dict:
+    """
+    Run a stage at most once per job: its outputs are checkpointed, and a retry
+    or reprocess gets them back from the checkpoint instead of running it again.
+    """
+    checkpoints = CheckpointStore(ctx["job_id"])
+    saved = checkpoints.load(name)
+    if saved is not None:
+        logger.info(f"[{ctx['job_id']}] Stage '{name}' restored from checkpoint")
+        return saved
+
+    with pipeline_stage(ctx, name, report_failure=report_failure):
+        outputs = stage(ctx)
+    checkpoints.save(name, outputs)
+    return outputs
 
-    # Step 1 — Join meeting, record audio + captions
-    recorded_file, captions = join_and_record_meeting(
-        request,
-        record_seconds=300,
-        output_file=audio_file
-    )
 
-    # Step 2 — Transcribe audio
-    transcript = transcribe_file_json_deepgram(recorded_file)
+@contextmanager
+def pipeline_stage(ctx: dict, name: str, report_failure: bool = True):
+    """
+    Record stage duration in ctx["stage_timings"] and report failures
+    to the summary stream.
+    """
+    started = time.monotonic()
+    logger.info(f"[{ctx.get('job_id')}] Stage '{name}' started")
+    try:
+        yield
+    except Exception as e:
+        logger.error(f"[{ctx.get('job_id')}] Stage '{name}' failed: {e}")
+        progress = get_progress(ctx) if report_failure else None
+        if progress:
+            progress.publish("error", {"stage": name, "message": str(e)})
+        raise
+    finally:
+        elapsed = round(time.monotonic() - started, 2)
+        ctx.setdefault("stage_timings", {})[name] = elapsed
+    logger.info(f"[{ctx.get('job_id')}] Stage '{name}' finished in {elapsed:.1f}s")
+
+
+def record_stage(ctx: dict) -> dict:
+    """
+    Step 1 — Join meeting, record audio + captions.
+    Captions are summarized window by window while the meeting is still running.
+    """
+    request = MeetRequest(**ctx["request"])
+
+    # Finalized captions go straight to Redis; a new recording starts a new stream
+    captions = CaptionStream(ctx["job_id"])
+    captions.clear()
+    incremental = None
+    if INCREMENTAL_SUMMARY_ENABLED:
+        incremental = IncrementalSummarizer(captions, on_progress=get_progress(ctx))
+        incremental.start()
+
+    # Closed audio segments are transcribed while the meeting is still running
+    rolling = None
+    if ROLLING_TRANSCRIPTION_ENABLED:
+        rolling = RollingTranscriber(os.path.join(ctx["meeting_folder"], "segments")).start()
 
-    # Step 3 — Upload audio to S3
-    s3_key = f"meetings/{user_id}/{meeting_id}/{timestamp}/meeting_audio.wav"
-    s3_response = upload_to_s3(recorded_file, S3_BUCKET, s3_key)
+    # The recording is uploaded while ffmpeg writes it; only the tail is left at hang-up
+    uploader = None
+    if S3_STREAMING_UPLOAD_ENABLED:
+        audio_key = audio_s3_key(ctx, ctx["audio_file"])
+        try:
+            uploader = StreamingS3Upload(
+                ctx["audio_file"], S3_BUCKET, audio_key, content_type=audio_mimetype(audio_key)
+            ).start()
+        except Exception as e:
+            logger.warning(f"[{ctx['job_id']}] Streaming upload unavailable, uploading after recording: {e}")
+
+    bot_resources = {}
+    join_timings = {}
+    recorded_file = None
+    try:
+        recorded_file, _ = join_and_record_meeting(
+            request,
+            record_seconds=300,
+            output_file=ctx["audio_file"],
+            shared_captions=captions,
+            resource_stats=bot_resources,
+            join_timings=join_timings,
+            segment_dir=rolling.segment_dir if rolling else None,
+            playback_dir=ctx.get("playback_dir"),
+        )
+    finally:
+        captions.close()
+        if uploader and not recorded_file:
+            uploader.abort()
 
     audio_object = None
-    if s3_response.status == "success":
-        audio_object = s3_key
-        logger.info(f"Uploaded to S3: {audio_object}")
-    else:
-        logger.error(f"S3 upload failed: {s3_response.detail}")
+    if uploader and recorded_file:
+        s3_response = uploader.finish()
+        if s3_response.status == "success":
+            audio_object = s3_response.object_name
+            logger.info(f"Uploaded to S3 while recording: {audio_object}")
+
+    # Nothing is awaited after hang-up: caption windows whose summary isn't ready
+    # and audio segments still being transcribed are left to the later stages
+    caption_chunks = incremental.finish() if incremental else []
+    rolling_segments = rolling.handoff() if rolling else None
+    outputs = {
+        "recorded_file": recorded_file,
+        "caption_stream": captions.key,
+        "caption_chunks": caption_chunks,
+        "rolling_segments": rolling_segments,
+        "transcription_metrics": transcription_metrics(),
+        "bot_resources": bot_resources,
+        "join_timings": join_timings,
+    }
+    # Left to the upload stage when it wasn't streamed up
+    if audio_object:
+        outputs["audio_object"] = audio_object
+    return outputs
+
+
+def iter_captions(ctx: dict):
+    """
+    Captions of the job, read from its Redis stream in batches
+    (jobs checkpointed before captions were streamed carry them in the context).
+    """
+    if ctx.get("caption_stream"):
+        return iter(CaptionStream(ctx["job_id"]))
+    return iter(ctx.get("captions") or [])
+
+
+def transcribe_stage(ctx: dict) -> dict:
+    """
+    Step 2 — Transcribe audio and merge it with the captions.
+    Segments transcribed during recording are reused: only the ones still in
+    flight at hang-up are transcribed here, and the full file when that fails.
+    """
+    metrics = ctx.get("transcription_metrics")
+    transcript = None
+    if ctx.get("rolling_segments"):
+        transcript = finish_segments(ctx["rolling_segments"], iter_captions(ctx))
+        metrics = transcription_metrics() or metrics
+    if not transcript:
+        ensure_local_audio(ctx)
+        # Hedged across the configured providers, with failover
+        transcript = transcribe_audio(ctx["recorded_file"])
+        metrics = transcription_metrics()
+        logger.info(f"[{ctx['job_id']}] Transcription provider metrics: {metrics}")
 
-    # Step 4 — Process transcript and generate summary
     results = process_meeting_transcript(
         transcript=transcript,
-        captions=captions
+        captions=iter_captions(ctx)
     )
 
     speakers = list({seg["speaker_name"] for seg in results["merged_transcript"]["transcript"]})
     logger.info(f"Speakers detected: {speakers}")
 
+    return {
+        "transcript": [utt.model_dump() for utt in transcript],
+        "merged_transcript": results.get("merged_transcript"),
+        "speakers": speakers,
+        "transcription_metrics": metrics,
+    }
+
+
+def meeting_s3_prefix(ctx: dict) -> str:
+    return f"meetings/{ctx['user_id']}/{ctx['meeting_key']}/{ctx['timestamp']}"
+
+
+def audio_s3_key(ctx: dict, file_path: str) -> str:
+    return f"{meeting_s3_prefix(ctx)}/{os.path.basename(file_path)}"
+
+
+def upload_stage(ctx: dict) -> dict:
+    """
+    Step 3 — Upload audio (and the playback manifest + segments, if recorded) to S3.
+    The audio is normally already there: it is streamed up during recording.
+    """
+    audio_object = ctx.get("audio_object")
+    if audio_object:
+        logger.info(f"Audio already in S3: {audio_object}")
+    else:
+        s3_key = audio_s3_key(ctx, ctx["recorded_file"])
+        s3_response = upload_to_s3(ctx["recorded_file"], S3_BUCKET, s3_key, content_type=audio_mimetype(s3_key))
+        if s3_response.status == "success":
+            audio_object = s3_key
+            logger.info(f"Uploaded to S3: {audio_object}")
+        else:
+            logger.error(f"S3 upload failed: {s3_response.detail}")
+    return {"audio_object": audio_object, "playback_manifest": upload_playback(ctx, meeting_s3_prefix(ctx))}
+
+
+def upload_playback(ctx: dict, s3_prefix: str) -> str:
+    """
+    Upload the HLS segments, then the manifest; returns the manifest's key (None if not recorded).
+    """
+    playback_dir = ctx.get("playback_dir")
+    if not playback_dir or not os.path.exists(os.path.join(playback_dir, PLAYBACK_MANIFEST)):
+        return ctx.get("playback_manifest")
+
+    # Manifest last: it is only stored once every segment it lists is there
+    names = sorted(name for name in os.listdir(playback_dir) if name != PLAYBACK_MANIFEST) + [PLAYBACK_MANIFEST]
+    for name in names:
+        key = f"{s3_prefix}/{PLAYBACK_DIR}/{name}"
+        s3_response = upload_to_s3(os.path.join(playback_dir, name), S3_BUCKET, key, content_type=audio_mimetype(name))
+        if s3_response.status != "success":
+            logger.error(f"Playback upload failed at {name}: {s3_response.detail}")
+            return None
+    logger.info(f"Uploaded playback manifest and {len(names) - 1} segments to S3")
+    return f"{s3_prefix}/{PLAYBACK_DIR}/{PLAYBACK_MANIFEST}"
+
+
+def ensure_local_audio(ctx: dict) -> None:
+    """
+    Reprocessing an old job: the local recording was cleaned up, fetch it back from S3.
+    """
+    if ctx.get("recorded_file") and not os.path.exists(ctx["recorded_file"]) and ctx.get("audio_object"):
+        logger.info(f"[{ctx['job_id']}] Local audio missing, downloading {ctx['audio_object']}")
+        download_from_s3(S3_BUCKET, ctx["audio_object"], ctx["recorded_file"])
+
+
+def _chat_meeting_id(ctx: dict) -> str:
+    return ctx["request"]["meet_url"].rstrip("/").split("/")[-1]
+
+
+def index_stage(ctx: dict) -> dict:
+    """
+    Step 4a — Index the raw transcript for meeting chat.
+    """
     transcript_text = "\n".join(
-        [f"{seg['speaker_name']}: {seg['text']}" for seg in results["merged_transcript"]["transcript"]]
+        [f"{seg['speaker_name']}: {seg['text']}" for seg in ctx["merged_transcript"]["transcript"]]
     )
     logger.info(f"Transcript Text:\n{transcript_text}")
 
-    meeting_id = request.meet_url.rstrip("/").split("/")[-1]
-    index_meeting(meeting_id=meeting_id, transcript_text=transcript_text)
+    index_meeting(meeting_id=_chat_meeting_id(ctx), transcript_text=transcript_text)
+    return {}
+
 
-    final_summary = generate_langchain_summary(transcript_text)
+def summarize_stage(ctx: dict) -> dict:
+    """
+    Step 4b — Generate the summary (from live caption windows when available,
+    otherwise from the merged transcript) and index the summary tree.
+    """
+    progress = get_progress(ctx)
+
+    summary_chunks = ctx.get("caption_chunks") or []
+    if summary_chunks:
+        logger.info(f"Summarizing from {len(summary_chunks)} live caption windows")
+        # Windows the recording worker didn't wait for (at least the last one)
+        summary_chunks = summarize_pending_chunks(summary_chunks, on_progress=progress)
+    else:
+        summary_chunks = summarize_segment_chunks(ctx["merged_transcript"]["transcript"], on_progress=progress)
+    final_summary = generate_meeting_summary_from_chunks(summary_chunks, on_progress=progress)
     logger.info(f"Final Summary:\n{final_summary}")
 
-    # Step 5 — Save meeting to DB (sync)
-    db_data = {
-        "transcript": transcript,
+    # Chunk summaries are kept (coarse retrieval layer + stored with the meeting).
+    # Indexing is optional like the index stage: a vector store outage mustn't lose the summary
+    if summary_chunks:
+        try:
+            index_meeting_summary_tree(
+                meeting_id=_chat_meeting_id(ctx), recording_id=ctx["job_id"], chunks=summary_chunks
+            )
+        except Exception as e:
+            logger.warning(f"[{ctx['job_id']}] Summary tree indexing skipped: {e}")
+
+    return {
         "summary": final_summary,
-        "captions": captions,
-        "merged_transcript": results.get("merged_transcript"),
-        "user_id": user_id,
+        "chunk_summaries": [
+            {key: chunk[key] for key in ("chunk_index", "start_time", "end_time", "speakers", "summary")}
+            for chunk in summary_chunks
+        ],
+    }
+
+
+def save_stage(ctx: dict):
+    """
+    Step 5 — Save meeting to DB and notify stream subscribers.
+    When reprocessing a saved job (ctx["meeting_id"]), the existing row is updated.
+    """
+    request = MeetRequest(**ctx["request"])
+    db_data = {
+        "transcript": ctx.get("transcript"),
+        "summary": ctx.get("summary"),
+        "captions": list(iter_captions(ctx)),
+        "merged_transcript": ctx.get("merged_transcript"),
+        "user_id": ctx["user_id"],
         "meet_url": request.meet_url,
-        "audio_object": audio_object,
-        "participants": speakers,
+        "audio_object": ctx.get("audio_object"),
+        "playback_manifest": ctx.get("playback_manifest"),
+        "participants": ctx.get("speakers"),
+        "chunk_summaries": ctx.get("chunk_summaries"),
     }
-    save_meeting_to_db(request, db_data)
+    meeting = save_meeting_to_db(request, db_data, meeting_id=ctx.get("meeting_id"))
+    logger.info(f"[{ctx.get('job_id')}] Stage timings (s): {ctx.get('stage_timings')}")
 
-    # Step 6 — Clean up
-    shutil.rmtree(meeting_folder, ignore_errors=True)
+    progress = get_progress(ctx)
+    if progress:
+        progress.publish("done", {
+            "meeting_id": str(meeting.id),
+            "summary": meeting.summary,
+            "stage_timings": ctx.get("stage_timings"),
+            "bot_resources": ctx.get("bot_resources"),
+            "join_timings": ctx.get("join_timings"),
+            "transcription_metrics": ctx.get("transcription_metrics"),
+        })
+    return {"meeting_id": str(meeting.id)}
 
 
-def save_meeting_to_db(request: MeetRequest, results: dict):
+def cleanup_job_files(ctx: dict) -> None:
+    """
+    Step 6 — Clean up the local recording once the meeting is saved.
+    Checkpoints are kept so the job can be reprocessed (audio is re-fetched from S3)
+    until they are older than MEETING_CHECKPOINT_RETENTION_DAYS.
+    """
+    shutil.rmtree(ctx["meeting_folder"], ignore_errors=True)
+    sweep_checkpoints()
+
+
+def save_meeting_to_db(request: MeetRequest, results: dict, meeting_id: str = None):
     """
     Sync DB save for Celery worker
     """
+    fields = dict(
+        participants=results.get("participants"),
+        transcript=[
+            utt if isinstance(utt, dict) else utt.model_dump()
+            for utt in results.get("transcript") or []
+        ],
+        summary=results.get("summary"),
+        captions=results.get("captions"),
+        chunk_summaries=results.get("chunk_summaries"),
+        merged_transcript=results.get("merged_transcript"),
+        user_id=results.get("user_id"),
+        meet_url=request.meet_url,
+        audio_object=results.get("audio_object"),
+        playback_manifest=results.get("playback_manifest"),
+    )
     with SessionLocal() as db:
-        meeting = Meeting(
-            title="Meeting",
-            participants=results.get("participants"),
-            start_time=datetime.now(timezone.utc),
-            transcript=[utt.dict() for utt in results.get("transcript", [])],
-            summary=results.get("summary"),
-            captions=results.get("captions"),
-            merged_transcript=results.get("merged_transcript"),
-            user_id=results.get("user_id"),
-            meet_url=request.meet_url,
-            audio_object=results.get("audio_object")
-        )
-        db.add(meeting)
+        meeting = db.get(Meeting, uuid.UUID(meeting_id)) if meeting_id else None
+        if meeting is None:
+            meeting = Meeting(title="Meeting", start_time=datetime.now(timezone.utc), **fields)
+            db.add(meeting)
+        else:
+            for key, value in fields.items():
+                setattr(meeting, key, value)
         db.commit()
         db.refresh(meeting)
     return meeting
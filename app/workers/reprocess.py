@@ -0,0 +1,36 @@
+"""
+Resume or redo the post-recording pipeline of a recorded meeting job.
+
+Usage:
+    python -m app.workers.reprocess <job_id>                      # resume from the last completed stage
+    python -m app.workers.reprocess <job_id> --from-stage summarize
+    python -m app.workers.reprocess <job_id> --inprocess          # run here instead of queueing tasks
+"""
+import argparse
+import logging
+
+from app.workers.meeting_worker import reprocess_meeting
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reprocess a recorded meeting job from its checkpoints")
+    parser.add_argument("job_id", help="Job id returned by /meetings/join-and-record")
+    parser.add_argument(
+        "--from-stage",
+        choices=["transcribe", "upload", "index", "summarize", "save"],
+        help="Redo this stage and every stage depending on it",
+    )
+    parser.add_argument("--inprocess", action="store_true", help="Run the stages in this process")
+    args = parser.parse_args()
+
+    ctx = reprocess_meeting(args.job_id, from_stage=args.from_stage, inprocess=args.inprocess)
+    if args.inprocess:
+        logger.info(f"Reprocessed job {args.job_id}, meeting {ctx.get('meeting_id')}")
+    else:
+        logger.info(f"Queued reprocessing of job {args.job_id}")
+
+
+if __name__ == "__main__":
+    main()
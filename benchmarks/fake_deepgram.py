@@ -0,0 +1,191 @@
+"""
+Local stand-in for Deepgram's pre-recorded API (POST /v1/listen), and a
+throughput benchmark of the transcription client against it.
+
+    python -m benchmarks.fake_deepgram serve --port 8765
+    DEEPGRAM_API_URL=http://127.0.0.1:8765 DEEPGRAM_API_KEY=test ...
+
+    python -m benchmarks.fake_deepgram bench --files 16 --size-mb 20 --latency 1
+
+The fake drains the request body in chunks, answers after --latency seconds
+with one diarized utterance per --utterance-seconds of audio (alternating
+speakers, durations estimated from the byte count) and counts connections,
+so connection reuse shows up as fewer connections than requests.
+"""
+import os
+import json
+import time
+import logging
+import argparse
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+# 16 kHz mono s16 PCM; close enough to size the fake transcript for other formats
+BYTES_PER_SECOND = 32000
+
+
+class FakeDeepgramHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def setup(self):
+        super().setup()
+        with self.server.stats_lock:
+            self.server.stats["connections"] += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _read_body(self) -> int:
+        """
+        Drain the body (Content-Length or chunked); returns its size.
+        """
+        received = 0
+        if "chunked" in self.headers.get("Transfer-Encoding", ""):
+            while True:
+                length = int(self.rfile.readline().strip(), 16)
+                if length == 0:
+                    self.rfile.readline()
+                    return received
+                received += len(self.rfile.read(length))
+                self.rfile.readline()
+        remaining = int(self.headers.get("Content-Length", 0))
+        while remaining:
+            chunk = self.rfile.read(min(65536, remaining))
+            if not chunk:
+                break
+            received += len(chunk)
+            remaining -= len(chunk)
+        return received
+
+    def do_POST(self):
+        if urlparse(self.path).path != "/v1/listen":
+            self.send_error(404)
+            return
+        if not self.headers.get("Authorization", "").startswith("Token "):
+            self.send_error(401)
+            return
+        size = self._read_body()
+        time.sleep(self.server.latency)
+
+        duration = size / BYTES_PER_SECOND
+        step = self.server.utterance_seconds
+        utterances = [
+            {
+                "start": round(start, 2),
+                "end": round(min(start + step, duration), 2),
+                "transcript": f"Utterance {index} of the fake meeting.",
+                "speaker": index % 2,
+                "confidence": 0.99,
+            }
+            for index, start in enumerate(x * step for x in range(int(duration // step) + 1))
+            if start < duration
+        ]
+        body = json.dumps({"metadata": {"duration": duration}, "results": {"utterances": utterances}}).encode()
+        with self.server.stats_lock:
+            self.server.stats["requests"] += 1
+            self.server.stats["bytes"] += size
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve_fake_deepgram(port: int = 0, latency: float = 0.5, utterance_seconds: float = 5.0) -> ThreadingHTTPServer:
+    """
+    Start the fake on localhost in a background thread (port 0: any free port).
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), FakeDeepgramHandler)
+    server.latency = latency
+    server.utterance_seconds = utterance_seconds
+    server.stats = {"connections": 0, "requests": 0, "bytes": 0}
+    server.stats_lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def bench(args) -> dict:
+    from app.utils.deepgram_client import DeepgramTranscriptionClient
+
+    server = serve_fake_deepgram(latency=args.latency)
+    folder = tempfile.mkdtemp(prefix="fake_deepgram_")
+    files = []
+    for index in range(args.files):
+        path = os.path.join(folder, f"audio_{index}.wav")
+        with open(path, "wb") as f:
+            for _ in range(args.size_mb):
+                f.write(os.urandom(1024 * 1024))
+        files.append(path)
+
+    process = psutil.Process()
+    rss_before = process.memory_info().rss
+    peak = {"rss": rss_before}
+    stop = threading.Event()
+
+    def sample():
+        while not stop.wait(0.05):
+            peak["rss"] = max(peak["rss"], process.memory_info().rss)
+
+    threading.Thread(target=sample, daemon=True).start()
+    client = DeepgramTranscriptionClient(
+        api_key="test", base_url=f"http://127.0.0.1:{server.server_port}", max_connections=args.concurrency
+    )
+    started = time.monotonic()
+    try:
+        results = client.utterances_many(files)
+    finally:
+        elapsed = time.monotonic() - started
+        stop.set()
+        client.close()
+        server.shutdown()
+        for path in files:
+            os.remove(path)
+        os.rmdir(folder)
+
+    return {
+        "files": args.files,
+        "size_mb": args.size_mb,
+        "concurrency": args.concurrency,
+        "seconds": round(elapsed, 2),
+        "files_per_second": round(args.files / elapsed, 2),
+        "utterances": sum(len(r) for r in results),
+        "rss_growth_mb": round((peak["rss"] - rss_before) / 1e6, 1),
+        "server": server.stats,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Deepgram API and transcription client benchmark")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("serve", help="run the fake API until interrupted")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--latency", type=float, default=0.5, help="seconds before each response")
+    serve.add_argument("--utterance-seconds", type=float, default=5.0)
+    run = sub.add_parser("bench", help="transcribe generated files through the client")
+    run.add_argument("--files", type=int, default=16)
+    run.add_argument("--size-mb", type=int, default=20)
+    run.add_argument("--concurrency", type=int, default=8)
+    run.add_argument("--latency", type=float, default=1.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    if args.command == "serve":
+        server = serve_fake_deepgram(args.port, args.latency, args.utterance_seconds)
+        print(f"Fake Deepgram listening on http://127.0.0.1:{server.server_port}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
+    else:
+        print(json.dumps(bench(args), indent=2))
+
+
+if __name__ == "__main__":
+    main()
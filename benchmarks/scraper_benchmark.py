@@ -0,0 +1,224 @@
+"""
+Benchmark the Meet join flow and the caption scraper against the local fake
+Meet page (benchmarks/fake_meet), without a live Google Meet.
+
+    python -m benchmarks.scraper_benchmark --modes dom snapshot observer --speed 2
+
+For every caption scrape mode it reports:
+- join latency and the time spent in each join state
+- WebDriver RPCs per scraper tick
+- caption latency: utterance complete in the page -> caption finalized
+- CPU of the scraper (this process) and CPU/RSS of the browser
+- finalization accuracy: word-level similarity of the finalized captions to
+  what the page said, per speaker
+"""
+import os
+import json
+import time
+import difflib
+import logging
+import argparse
+import tempfile
+import threading
+import statistics
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+from app.schemas.meet import MeetRequest
+from app.services.meetings import join_meeting
+from app.services.meetings.browser_pool import BrowserResourceMonitor
+from app.services.meetings.join_state import JoinStateMachine, IN_CALL
+
+logger = logging.getLogger(__name__)
+
+FAKE_MEET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_meet")
+SCRAPE_MODES = ["dom", "snapshot", "observer"]
+
+# Scraper ticks of the mode being benchmarked
+TICKS = {"count": 0}
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_fake_meet() -> ThreadingHTTPServer:
+    """
+    Serve the fake Meet page on a free localhost port (pages fetch their timeline).
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(QuietHandler, directory=FAKE_MEET_DIR))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class RpcCounter:
+    """
+    Counts WebDriver commands; element calls go through driver.execute too.
+    """
+
+    def __init__(self, driver):
+        self.count = 0
+        self._lock = threading.Lock()
+        original = driver.execute
+
+        def execute(command, params=None):
+            with self._lock:
+                self.count += 1
+            return original(command, params)
+
+        driver.execute = execute
+
+
+class TimedCaptions(list):
+    """
+    Caption sink remembering when each caption was finalized.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.finalized_at = []
+
+    def append(self, caption):
+        self.finalized_at.append(time.time())
+        super().append(caption)
+
+
+def count_ticks():
+    """
+    Wrap the scraper's per-tick readers (once) so ticks can be counted.
+    """
+    for name in ("read_caption_blocks", "drain_caption_events"):
+        original = getattr(join_meeting, name)
+
+        def wrapped(*args, _original=original, **kwargs):
+            TICKS["count"] += 1
+            return _original(*args, **kwargs)
+
+        setattr(join_meeting, name, wrapped)
+
+
+def words(text: str) -> list:
+    return [word.strip(".,?!").lower() for word in text.split() if word.strip(".,?!")]
+
+
+def accuracy(truth: list, captions: list) -> dict:
+    """
+    Word-level similarity (0-1) of finalized captions to the spoken text, per speaker.
+    """
+    scores = {}
+    for speaker in sorted({record["speaker"] for record in truth}):
+        expected = words(" ".join(r["text"] for r in truth if r["speaker"] == speaker))
+        got = words(" ".join(c["text"] for c in captions if c["speaker"] == speaker))
+        scores[speaker] = round(difflib.SequenceMatcher(None, expected, got, autojunk=False).ratio(), 3)
+    return scores
+
+
+def caption_latencies(truth: list, captions: TimedCaptions) -> list:
+    """
+    Seconds from an utterance being complete in the page to the caption with
+    its last words being finalized.
+    """
+    latencies = []
+    for caption, finalized_at in zip(captions, captions.finalized_at):
+        tail = words(caption["text"])[-3:]
+        for record in truth:
+            if record["speaker"] != caption["speaker"] or not record["completedAt"]:
+                continue
+            spoken = words(record["text"])
+            if tail and spoken[-len(tail):] == tail:
+                latencies.append(finalized_at - record["completedAt"])
+                break
+    return latencies
+
+
+def run_mode(mode: str, url: str, args) -> dict:
+    profile_dir = tempfile.mkdtemp(prefix=f"bench_{mode}_")
+    driver = join_meeting.setup_chrome(profile_dir=profile_dir, mode=args.browser_mode)
+    rpcs = RpcCounter(driver)
+    TICKS["count"] = 0
+    try:
+        # Step 1 — Join
+        join = JoinStateMachine(driver)
+        started = time.monotonic()
+        if not join_meeting.join_call(driver, MeetRequest(meet_url=url, guest_name="Benchmark Bot"), join):
+            raise RuntimeError(f"Bot did not get into the fake call (state: {join.state})")
+        join_latency = time.monotonic() - started
+
+        # Step 2 — Scrape until the page ends the call
+        captions = TimedCaptions()
+        stop = threading.Event()
+        monitor = BrowserResourceMonitor(driver, interval=1).start()
+        rpcs_before, cpu_before, polls = rpcs.count, time.process_time(), 0
+        scrape_started = time.monotonic()
+        scraper = threading.Thread(
+            target=join_meeting.scrape_captions_json,
+            args=(driver, stop, args.interval, 1.5, time.time(), captions, mode),
+            daemon=True,
+        )
+        scraper.start()
+        while join.poll() == IN_CALL:
+            polls += 1
+            time.sleep(1)
+        stop.set()
+        scraper.join()
+        scrape_seconds = time.monotonic() - scrape_started
+        # Minus the join.poll() calls of the loop above (the last one saw the call end)
+        scraper_rpcs = rpcs.count - rpcs_before - polls - 1
+        cpu_seconds = time.process_time() - cpu_before
+        browser = monitor.stop()
+
+        # Step 3 — Compare with what was said
+        truth = driver.execute_script("return window.__fakeMeet.truth")
+        latencies = caption_latencies(truth, captions)
+        return {
+            "mode": mode,
+            "join_latency_s": round(join_latency, 2),
+            "join_timings": join.finish(),
+            "ticks": TICKS["count"],
+            "rpcs_per_tick": round(scraper_rpcs / max(1, TICKS["count"]), 2),
+            "captions": len(captions),
+            "caption_latency_median_s": round(statistics.median(latencies), 2) if latencies else None,
+            "caption_latency_max_s": round(max(latencies), 2) if latencies else None,
+            "scraper_cpu_percent": round(100 * cpu_seconds / scrape_seconds, 1),
+            "browser": browser,
+            "accuracy": accuracy(truth, captions),
+        }
+    finally:
+        driver.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the caption scraper against the fake Meet page")
+    parser.add_argument("--modes", nargs="+", choices=SCRAPE_MODES, default=SCRAPE_MODES)
+    parser.add_argument("--timeline", default="standup.json", help="file under benchmarks/fake_meet/timelines")
+    parser.add_argument("--speed", type=float, default=1.0, help="timeline playback speed multiplier")
+    parser.add_argument("--words-per-sec", type=float, default=3.0)
+    parser.add_argument("--rewrite", type=float, default=0.0, help="probability of a rewritten word per tick")
+    parser.add_argument("--approval-ms", type=int, default=0, help="time in the host lobby")
+    parser.add_argument("--interval", type=float, default=join_meeting.CAPTION_POLL_INTERVAL, help="scraper tick")
+    parser.add_argument("--browser-mode", choices=["lite", "full"], default="lite")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    count_ticks()
+    server = serve_fake_meet()
+    url = (
+        f"http://127.0.0.1:{server.server_port}/index.html?timeline={args.timeline}&speed={args.speed}"
+        f"&words_per_sec={args.words_per_sec}&rewrite={args.rewrite}&approval_ms={args.approval_ms}"
+    )
+    try:
+        results = [run_mode(mode, url, args) for mode in args.modes]
+    finally:
+        server.shutdown()
+
+    for result in results:
+        print(json.dumps(result, indent=2))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
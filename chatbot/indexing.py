@@ -4,6 +4,7 @@ from chromadb import HttpClient
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain.schema import Document
 from dotenv import load_dotenv
+from app.services.meeting_pipeline.compaction import compact_transcript_text, expand_aliases
 import os
 
 # Load environment variables
@@ -20,6 +21,9 @@ embeddings = CohereEmbeddings(model="large")
 client = HttpClient(host="chroma", port=8000)
 
 def index_meeting(meeting_id: str, transcript_text: str, metadata: dict = None):
+    # Compact transcript (speaker names are kept so questions about a person still match)
+    transcript_text, _ = compact_transcript_text(transcript_text, alias_speakers=False)
+
     # Split transcript
     splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
     chunks = splitter.split_text(transcript_text)
@@ -42,3 +46,64 @@ def index_meeting(meeting_id: str, transcript_text: str, metadata: dict = None):
     )
 
     return vectorstore
+
+
+def index_meeting_summary_tree(meeting_id: str, recording_id: str, chunks: list[dict], metadata: dict = None):
+    """
+    Index the meeting as a two-level tree:
+    - "meeting_summaries": one document per chunk summary (coarse layer)
+    - "meeting_chunks": the raw text of each summarized chunk (real speaker
+      names on every line), split into small pieces that keep the chunk_index
+      of their parent summary (fine layer)
+
+    meeting_id is what chat filters on (the Meet code); recording_id (the job id)
+    keys the tree, so recurring Meet links don't mix chunk_index drill-downs
+    across recordings. Document ids are deterministic and the recording's old
+    documents are replaced, so reprocessing doesn't add duplicates.
+    """
+    base_metadata = {**(metadata or {}), "meeting_id": meeting_id, "recording_id": recording_id}
+
+    summary_docs = [
+        Document(
+            page_content=chunk["summary"],
+            metadata={
+                **base_metadata,
+                "chunk_index": chunk["chunk_index"],
+                "start_time": chunk.get("start_time") or "",
+                "end_time": chunk.get("end_time") or "",
+                "speakers": ", ".join(chunk.get("speakers", [])),
+            },
+        )
+        for chunk in chunks
+    ]
+    summary_ids = [f"{recording_id}:summary:{chunk['chunk_index']}" for chunk in chunks]
+
+    splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=0)
+    raw_docs, raw_ids = [], []
+    for chunk in chunks:
+        for idx, piece in enumerate(splitter.split_text(expand_aliases(chunk["text"]))):
+            raw_docs.append(Document(
+                page_content=piece,
+                metadata={**base_metadata, "chunk_index": chunk["chunk_index"], "piece_index": idx},
+            ))
+            raw_ids.append(f"{recording_id}:chunk:{chunk['chunk_index']}:{idx}")
+
+    for collection_name in ("meeting_summaries", "meeting_chunks"):
+        client.get_or_create_collection(collection_name).delete(where={"recording_id": recording_id})
+
+    summaries_store = Chroma.from_documents(
+        documents=summary_docs,
+        embedding=embeddings,
+        ids=summary_ids,
+        collection_name="meeting_summaries",
+        client=client
+    )
+    Chroma.from_documents(
+        documents=raw_docs,
+        embedding=embeddings,
+        ids=raw_ids,
+        collection_name="meeting_chunks",
+        client=client
+    )
+
+    return summaries_store
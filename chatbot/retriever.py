@@ -1,7 +1,16 @@
+import os
+from typing import List
 from langchain_cohere import CohereEmbeddings
 from langchain_chroma import Chroma
+from langchain.schema import Document
+from langchain_core.runnables import RunnableLambda
 from chromadb import HttpClient
 
+# Summaries searched first, then raw pieces searched only inside the matched summaries
+SUMMARY_K = int(os.getenv("RETRIEVER_SUMMARY_K", "3"))
+RAW_K = int(os.getenv("RETRIEVER_RAW_K", "3"))
+
+
 def get_retriever(meeting_id: str):
     embeddings = CohereEmbeddings(model="large")
 
@@ -13,7 +22,56 @@ def get_retriever(meeting_id: str):
         collection_name="meetings",
         embedding_function=embeddings,
     )
-
-    return vectorstore.as_retriever(
+    summaries_store = Chroma(
+        client=client,
+        collection_name="meeting_summaries",
+        embedding_function=embeddings,
+    )
+    chunks_store = Chroma(
+        client=client,
+        collection_name="meeting_chunks",
+        embedding_function=embeddings,
+    )
+    flat_retriever = vectorstore.as_retriever(
         search_kwargs={"k": 3, "filter": {"meeting_id": meeting_id}}
     )
+
+    def retrieve(question: str) -> List[Document]:
+        # Embed the question once and reuse the vector for both layers
+        query_vector = embeddings.embed_query(question)
+
+        summary_docs = summaries_store.similarity_search_by_vector(
+            query_vector, k=SUMMARY_K, filter={"meeting_id": meeting_id}
+        )
+        if not summary_docs:
+            # Meeting indexed before the summary tree existed
+            return flat_retriever.invoke(question)
+
+        # Drill down per recording: a recurring Meet link has several trees
+        chunk_indices = {}
+        for doc in summary_docs:
+            chunk_indices.setdefault(doc.metadata.get("recording_id"), set()).add(doc.metadata["chunk_index"])
+        branches = [
+            {"$and": [
+                {"recording_id": recording_id} if recording_id else {"meeting_id": meeting_id},
+                {"chunk_index": {"$in": sorted(indices)}},
+            ]}
+            for recording_id, indices in chunk_indices.items()
+        ]
+        raw_docs = chunks_store.similarity_search_by_vector(
+            query_vector,
+            k=RAW_K,
+            filter=branches[0] if len(branches) == 1 else {"$or": branches},
+        )
+
+        # Summaries in meeting order with their time range, then the supporting raw text
+        summary_docs.sort(key=lambda doc: (doc.metadata.get("recording_id") or "", doc.metadata["chunk_index"]))
+        return [
+            Document(
+                page_content=f"[{doc.metadata.get('start_time')} - {doc.metadata.get('end_time')}] Summary:\n{doc.page_content}",
+                metadata=doc.metadata,
+            )
+            for doc in summary_docs
+        ] + raw_docs
+
+    return RunnableLambda(retrieve)
@@ -0,0 +1,21 @@
+import pytest
+
+pytest.importorskip("langchain_text_splitters")
+
+from app.services.meeting_pipeline.compaction import clean_text
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("I I I think so", "I think so"),
+        ("we sold 1 1 2 units", "we sold 1 1 2 units"),
+        ("room 4 4 is free", "room 4 4 is free"),
+        ("that that is it", "that that is it"),
+        ("Mm-hmm, that works", "that works"),
+        ("uh-huh yes", "yes"),
+        ("um, you know, it works", "you know, it works"),
+    ],
+)
+def test_clean_text(text, expected):
+    assert clean_text(text) == expected